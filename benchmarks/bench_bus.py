@@ -0,0 +1,63 @@
+"""Benchmark ``EventBus`` against synchronous ``send``.
+
+Sends signals from several senders to one receiver, either with
+``send`` or by posting them to an ``EventBus`` and waiting for them to
+be delivered, and reports the throughput and, for the bus, the time
+the caller spends in ``post``.
+
+The receiver optionally sleeps, standing in for receivers which wait
+on I/O; the bus then delivers signals from different senders in
+parallel.
+
+Run from the top of the source tree::
+
+    python -m benchmarks.bench_bus [signals] [senders] [sleep_us] [workers]
+"""
+
+import sys
+import time
+
+import louie
+from louie.bus import EventBus
+
+
+def main(signals=20000, senders=8, sleep_us=0, workers=4):
+    delay = sleep_us / 1e6
+
+    def receiver(value):
+        if delay:
+            time.sleep(delay)
+
+    louie.reset()
+    louie.connect(receiver, "bench", weak=False)
+    names = [f"sender{index}" for index in range(senders)]
+
+    start = time.perf_counter()
+    for index in range(signals):
+        louie.send("bench", names[index % senders], value=index)
+    direct = time.perf_counter() - start
+
+    bus = EventBus(workers=workers)
+    start = time.perf_counter()
+    for index in range(signals):
+        bus.post("bench", names[index % senders], value=index)
+    posted = time.perf_counter() - start
+    bus.join()
+    queued = time.perf_counter() - start
+    bus.shutdown()
+    assert bus.delivered == signals, bus.delivered
+    louie.reset()
+
+    print(
+        f"{signals} signals from {senders} senders, "
+        f"receiver sleeping {sleep_us} us, {workers} workers"
+    )
+    print(f"send:     {signals / direct:10.0f} signals/s")
+    print(
+        f"EventBus: {signals / queued:10.0f} signals/s "
+        f"({posted / signals * 1e6:.3f} us per post)"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
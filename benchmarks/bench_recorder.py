@@ -0,0 +1,72 @@
+"""Benchmark the overhead of ``RecorderPlugin``.
+
+Times sends to a few receivers without a plugin, with a plugin which
+does nothing, and with a ``RecorderPlugin`` writing to a temporary
+log, and reports the time per send and the size of the log per
+record.  The difference between the last two is the cost of
+recording.
+
+Run from the top of the source tree::
+
+    python -m benchmarks.bench_recorder [sends] [receivers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import louie
+from louie.recorder import RecorderPlugin
+
+
+class NullPlugin(louie.Plugin):
+    pass
+
+
+def _receivers(count):
+    def make():
+        def receiver(value, name):
+            pass
+
+        return receiver
+
+    return [make() for _ in range(count)]
+
+
+def _time(sends):
+    start = time.perf_counter()
+    for index in range(sends):
+        louie.send("bench", "sender", value=index, name="payload")
+    return (time.perf_counter() - start) / sends
+
+
+def main(sends=100000, receivers=4):
+    louie.reset()
+    functions = _receivers(receivers)
+    for function in functions:
+        louie.connect(function, "bench", weak=False)
+    plain = _time(sends)
+    louie.install_plugin(NullPlugin())
+    null = _time(sends)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "signals.log")
+        recorder = RecorderPlugin(path)
+        louie.install_plugin(recorder)
+        recorded = _time(sends)
+        recorder.close()
+        size = os.path.getsize(path)
+    louie.reset()
+
+    print(f"{sends} sends to {receivers} receivers")
+    print(f"no plugin:      {plain * 1e6:8.3f} us per send")
+    print(f"null plugin:    {null * 1e6:8.3f} us per send")
+    print(
+        f"RecorderPlugin: {recorded * 1e6:8.3f} us per send "
+        f"({(recorded - null) * 1e6:.3f} us recording, "
+        f"{size / sends:.1f} bytes per record)"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,103 @@
+"""Benchmark importing modules of receivers, connected or registered.
+
+Writes two modules which each define many receivers, one connecting
+them with ``connect`` when imported and one registering them with the
+``receiver`` decorator, and reports the time to import each and to
+make the first send of every signal, which connects the registered
+receivers.  Also reports the time to register receivers by import
+path, which imports nothing until a send needs them.
+
+Run from the top of the source tree::
+
+    python -m benchmarks.bench_registry [receivers] [signals]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import louie
+
+HEADER = """
+import louie
+
+SIGNALS = {signals!r}
+"""
+
+CONNECTED = """
+def receiver{index}(value):
+    pass
+
+louie.connect(receiver{index}, SIGNALS[{index} % len(SIGNALS)])
+"""
+
+REGISTERED = """
+@louie.receiver(SIGNALS[{index} % len(SIGNALS)])
+def receiver{index}(value):
+    pass
+"""
+
+
+def _write(directory, name, template, receivers, signals):
+    with open(os.path.join(directory, name + ".py"), "w") as f:
+        f.write(HEADER.format(signals=signals))
+        for index in range(receivers):
+            f.write(template.format(index=index))
+
+
+def _import(name, signals):
+    louie.reset()
+    start = time.perf_counter()
+    importlib.import_module(name)
+    imported = time.perf_counter() - start
+    start = time.perf_counter()
+    for signal in signals:
+        louie.send(signal, value=None)
+    sent = time.perf_counter() - start
+    return imported, sent
+
+
+def main(receivers=2000, signals=20):
+    names = [f"signal{index}" for index in range(signals)]
+    with tempfile.TemporaryDirectory() as directory:
+        _write(directory, "bench_connected", CONNECTED, receivers, names)
+        _write(directory, "bench_registered", REGISTERED, receivers, names)
+        sys.path.insert(0, directory)
+        try:
+            # Compile both modules, so compiling is not counted.
+            for name in ("bench_connected", "bench_registered"):
+                importlib.import_module(name)
+                del sys.modules[name]
+            connected = _import("bench_connected", names)
+            registered = _import("bench_registered", names)
+            louie.reset()
+            start = time.perf_counter()
+            louie.register(
+                [
+                    (f"bench_registered:receiver{index}", names[index % signals])
+                    for index in range(receivers)
+                ]
+            )
+            by_path = time.perf_counter() - start
+        finally:
+            sys.path.remove(directory)
+            sys.modules.pop("bench_connected", None)
+            sys.modules.pop("bench_registered", None)
+    louie.reset()
+
+    print(f"{receivers} receivers of {signals} signals")
+    for label, (imported, sent) in (
+        ("connect:   ", connected),
+        ("@receiver: ", registered),
+    ):
+        print(
+            f"{label} import {imported * 1e3:8.3f} ms, "
+            f"first sends {sent * 1e3:8.3f} ms"
+        )
+    print(f"register by path:  {by_path * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,120 @@
+"""Benchmark the shared memory ring against the pipe bridge.
+
+A child process sends signals through a ``RingSender`` or a
+``BridgeSender``, each carrying the time it was sent.  The parent
+re-sends them to a local receiver and reports the throughput and the
+latency from send in the child to delivery in the parent, which relies
+on ``time.monotonic`` being system wide, as it is on Linux and macOS.
+
+Signals are sent as fast as possible, so latency includes queueing,
+unless a rate in signals per second is given.
+
+Run from the top of the source tree::
+
+    python -m benchmarks.bench_ringbuffer [signals] [rate]
+"""
+
+import multiprocessing
+import statistics
+import sys
+import time
+
+import louie
+from louie.bridge import BridgeReceiver, BridgeSender
+from louie.ringbuffer import RingBuffer, RingReceiver, RingSender
+
+
+def _send(count, rate):
+    clock = time.monotonic
+    if not rate:
+        for _ in range(count):
+            louie.send("tick", sent=clock())
+        return
+    start = clock()
+    for index in range(count):
+        due = start + index / rate
+        while clock() < due:
+            pass
+        louie.send("tick", sent=clock())
+
+
+def _ring_child(name, count, rate):
+    ring = RingBuffer(name)
+    sender = RingSender(ring, ["tick"])
+    _send(count, rate)
+    sender.close()
+    ring.close()
+
+
+def _bridge_child(connection, count, rate):
+    bridge = BridgeSender(connection, ["tick"])
+    _send(count, rate)
+    bridge.close()
+
+
+class Receiver(object):
+    def __init__(self):
+        self.latencies = []
+
+    def __call__(self, sent):
+        self.latencies.append(time.monotonic() - sent)
+
+
+def _report(name, count, elapsed, latencies):
+    latencies = sorted(latencies)
+    assert len(latencies) == count, len(latencies)
+    print(
+        f"{name:6} {count / elapsed:10.0f} signals/s   latency "
+        f"median {statistics.median(latencies) * 1e6:8.1f} us   "
+        f"p99 {latencies[int(count * 0.99)] * 1e6:8.1f} us"
+    )
+
+
+def bench_ring(context, count, rate):
+    louie.reset()
+    receiver = Receiver()
+    louie.connect(receiver, "tick")
+    ring = RingBuffer(slots=4096, record_size=128)
+    remote = RingReceiver(ring)
+    remote.start()
+    process = context.Process(target=_ring_child, args=(ring.name, count, rate))
+    start = time.perf_counter()
+    process.start()
+    while len(receiver.latencies) < count and process.is_alive():
+        time.sleep(0.001)
+    process.join()
+    remote.stop()
+    elapsed = time.perf_counter() - start
+    ring.close()
+    _report("ring", count, elapsed, receiver.latencies)
+
+
+def bench_bridge(context, count, rate):
+    louie.reset()
+    receiver = Receiver()
+    louie.connect(receiver, "tick")
+    left, right = context.Pipe()
+    remote = BridgeReceiver(right)
+    remote.start()
+    process = context.Process(target=_bridge_child, args=(left, count, rate))
+    start = time.perf_counter()
+    process.start()
+    left.close()
+    process.join()
+    remote.join()
+    elapsed = time.perf_counter() - start
+    _report("bridge", count, elapsed, receiver.latencies)
+
+
+def main(count=100000, rate=0):
+    context = multiprocessing.get_context("spawn")
+    # Warm up process creation, so it is not counted in the first run.
+    process = context.Process(target=_send, args=(0, 0))
+    process.start()
+    process.join()
+    bench_ring(context, count, rate)
+    bench_bridge(context, count, rate)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
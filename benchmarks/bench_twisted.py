@@ -0,0 +1,69 @@
+"""Benchmark ``TwistedDispatchPlugin`` with a local reactor.
+
+Sends a signal to many receivers through the plugin, then runs a
+reactor of its own until every queued call is made, and compares the
+time per receiver call with plain ``send``.  Also reports how many
+delayed calls the sends scheduled on the reactor.
+
+Run from the top of the source tree::
+
+    python -m benchmarks.bench_twisted [receivers] [sends]
+"""
+
+import sys
+import time
+
+from twisted.internet.selectreactor import SelectReactor
+
+import louie
+
+
+def _receivers(count, calls):
+    def make():
+        def receiver():
+            calls.append(None)
+
+        return receiver
+
+    return [make() for _ in range(count)]
+
+
+def main(receivers=100, sends=1000):
+    calls = []
+    functions = _receivers(receivers, calls)
+
+    louie.reset()
+    for function in functions:
+        louie.connect(function, "bench", weak=False)
+    start = time.perf_counter()
+    for _ in range(sends):
+        louie.send("bench")
+    direct = time.perf_counter() - start
+
+    reactor = SelectReactor()
+    louie.install_plugin(louie.TwistedDispatchPlugin(reactor))
+    del calls[:]
+    start = time.perf_counter()
+    for _ in range(sends):
+        louie.send("bench")
+    queued = time.perf_counter() - start
+    delayed = len(reactor.getDelayedCalls())
+    reactor.callLater(0, reactor.stop)
+    start = time.perf_counter()
+    reactor.run(installSignalHandlers=False)
+    fired = time.perf_counter() - start
+    assert len(calls) == receivers * sends, len(calls)
+    louie.reset()
+
+    total = receivers * sends
+    print(f"{receivers} receivers, {sends} sends")
+    print(f"send:                  {direct / total * 1e6:8.3f} us per call")
+    print(
+        f"TwistedDispatchPlugin: {(queued + fired) / total * 1e6:8.3f} us per call "
+        f"({queued / total * 1e6:.3f} queueing, {fired / total * 1e6:.3f} in reactor)"
+    )
+    print(f"delayed calls scheduled: {delayed}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
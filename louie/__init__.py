@@ -1,48 +1,137 @@
-from . import dispatcher, error, plugin, robustapply, saferef, sender, signal, version
+from . import (
+    breaker,
+    bridge,
+    bus,
+    dispatcher,
+    error,
+    mailbox,
+    plugin,
+    recorder,
+    reentry,
+    registry,
+    response,
+    robustapply,
+    saferef,
+    sender,
+    signal,
+    signalregistry,
+    timer,
+    trace,
+    version,
+    watchdog,
+)
+from .breaker import CircuitBreaker
+from .bus import EventBus, PriorityBus
 from .dispatcher import (
+    BoundSignal,
+    Connection,
+    Snapshot,
+    bind,
     connect,
+    connect_many,
     disconnect,
+    disconnect_all,
+    disconnect_many,
     get_all_receivers,
+    install_circuit_breaker,
+    remove_circuit_breaker,
     reset,
+    restore,
     send,
+    send_batch,
     send_exact,
     send_minimal,
     send_robust,
+    set_sender_limits,
+    snapshot,
 )
 from .plugin import (
+    AsyncioDispatchPlugin,
     Plugin,
     QtWidgetPlugin,
     TwistedDispatchPlugin,
     install_plugin,
     remove_plugin,
 )
+from .reentry import ReentrancyPlugin
+from .registry import Registry, receiver, register
+from .response import CircuitOpen, Deferred, Dropped, Queued, Skipped
 from .sender import Anonymous, Any
 from .signal import All, Signal
+from .signalregistry import SignalRegistry
+from .timer import Timer, TimerWheel, send_every, send_later
+from .trace import TracePlugin
+from .watchdog import WatchdogPlugin
 
 __all__ = [
+    "breaker",
+    "bridge",
+    "bus",
     "dispatcher",
     "error",
+    "mailbox",
     "plugin",
+    "recorder",
+    "reentry",
+    "registry",
+    "response",
     "robustapply",
     "saferef",
     "sender",
     "signal",
+    "signalregistry",
+    "timer",
+    "trace",
     "version",
+    "watchdog",
+    "BoundSignal",
+    "Connection",
+    "Snapshot",
+    "bind",
     "connect",
+    "connect_many",
     "disconnect",
+    "disconnect_all",
+    "disconnect_many",
     "get_all_receivers",
+    "install_circuit_breaker",
+    "remove_circuit_breaker",
     "reset",
+    "restore",
     "send",
+    "send_batch",
     "send_exact",
     "send_minimal",
     "send_robust",
+    "set_sender_limits",
+    "snapshot",
+    "send_later",
+    "send_every",
+    "Timer",
+    "TimerWheel",
     "install_plugin",
     "remove_plugin",
+    "receiver",
+    "register",
+    "Registry",
     "Plugin",
+    "AsyncioDispatchPlugin",
     "QtWidgetPlugin",
     "TwistedDispatchPlugin",
+    "ReentrancyPlugin",
+    "TracePlugin",
+    "WatchdogPlugin",
+    "CircuitBreaker",
+    "EventBus",
+    "PriorityBus",
+    "CircuitOpen",
+    "Dropped",
+    "Queued",
+    "Deferred",
+    "Skipped",
     "Anonymous",
     "Any",
     "All",
     "Signal",
+    "SignalRegistry",
 ]
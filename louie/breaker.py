@@ -0,0 +1,140 @@
+"""Circuit breaker for ``send_robust``.
+
+A receiver that raises every time it is called, for instance because
+something it depends on is unavailable, still costs an exception and a
+traceback on every send.  A ``CircuitBreaker`` counts consecutive
+failures per receiver and, once a receiver has failed ``threshold``
+times in a row, its circuit *opens*: ``send_robust`` skips the
+receiver and returns ``CircuitOpen`` as its response.
+
+After ``cooldown`` seconds the circuit is *half-open*: the next send
+lets one call through.  If that call succeeds the circuit closes
+again, otherwise it reopens for another cooldown.
+
+Install a breaker with ``dispatcher.install_circuit_breaker``.
+"""
+
+import threading
+import time
+import weakref
+
+from louie import saferef
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+WEAKREF_TYPES = (weakref.ReferenceType, saferef.BoundMethodWeakref)
+
+
+class CircuitBreaker(object):
+    """Per-receiver circuit breaker.
+
+    - ``threshold``: Number of consecutive failures after which the
+      circuit of a receiver opens.
+
+    - ``cooldown``: Number of seconds a circuit stays open before a
+      call is let through again.
+
+    - ``clock``: Callable returning the current time in seconds.
+
+    Receivers are identified by the references stored in the
+    dispatcher's routing tables, so the same receiver connected to
+    several signals or senders shares a single circuit.  Only
+    receivers which are currently failing take up space.
+    """
+
+    def __init__(self, threshold=5, cooldown=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        # { receiver : [failures, opened_at] }
+        self._failing = {}
+        self._lock = threading.Lock()
+
+    def allow(self, receiver):
+        """Return True if ``receiver`` may be called now."""
+        entry = self._failing.get(receiver)
+        if entry is None or entry[0] < self.threshold:
+            return True
+        with self._lock:
+            now = self.clock()
+            if now - entry[1] < self.cooldown:
+                return False
+            # Half-open: let this call through, and keep other callers
+            # out until it finishes or another cooldown expires.
+            entry[1] = now
+            return True
+
+    def success(self, receiver):
+        """Record a successful call of ``receiver``."""
+        if receiver in self._failing:
+            with self._lock:
+                self._failing.pop(receiver, None)
+
+    def failure(self, receiver):
+        """Record a failed call of ``receiver``."""
+        with self._lock:
+            entry = self._failing.get(receiver)
+            if entry is None:
+                self._failing[receiver] = entry = [0, 0.0]
+            entry[0] += 1
+            if entry[0] >= self.threshold:
+                entry[1] = self.clock()
+                if entry[0] == self.threshold:
+                    self._prune()
+
+    def state(self, receiver):
+        """Return the circuit state of ``receiver``.
+
+        ``receiver`` may be the receiver itself or a reference to it
+        as stored in the routing tables.  Returns ``CLOSED``, ``OPEN``
+        or ``HALF_OPEN``.
+        """
+        entry = self._failing.get(self._key(receiver))
+        if entry is None or entry[0] < self.threshold:
+            return CLOSED
+        if self.clock() - entry[1] < self.cooldown:
+            return OPEN
+        return HALF_OPEN
+
+    def states(self):
+        """Return a ``{ receiver : state }`` dictionary for all receivers
+        whose circuit is not closed."""
+        with self._lock:
+            receivers = list(self._failing)
+        result = {}
+        for receiver in receivers:
+            state = self.state(receiver)
+            if state != CLOSED:
+                result[receiver] = state
+        return result
+
+    def reset(self, receiver=None):
+        """Close the circuit of ``receiver``, or of all receivers."""
+        with self._lock:
+            if receiver is None:
+                self._failing.clear()
+            else:
+                self._failing.pop(self._key(receiver), None)
+
+    def _key(self, receiver):
+        if isinstance(receiver, WEAKREF_TYPES) or receiver in self._failing:
+            # A reference, or a receiver connected with weak=False.
+            return receiver
+        try:
+            return saferef.safe_ref(receiver)
+        except TypeError:
+            # Not weakly referencable, so stored as a strong reference.
+            return receiver
+
+    def _prune(self):
+        """Forget receivers which have been garbage collected."""
+        for receiver in list(self._failing):
+            if (
+                isinstance(
+                    receiver, (weakref.ReferenceType, saferef.BoundMethodWeakref)
+                )
+                and receiver() is None
+            ):
+                del self._failing[receiver]
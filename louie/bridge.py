@@ -0,0 +1,227 @@
+"""Bridge signals between processes.
+
+A ``BridgeSender`` is connected as a receiver for chosen signals.  It
+collects the signals it receives into batches, encodes each batch with
+a codec and writes it to a connection.  A ``BridgeReceiver`` in another
+process reads the batches and re-sends each signal through its local
+dispatcher.
+
+Connections are ``multiprocessing.connection.Connection`` objects, or
+anything else with the same ``send_bytes``, ``recv_bytes``, ``poll``
+and ``close`` methods, so both ends of a ``multiprocessing.Pipe`` and
+Unix domain sockets made with ``multiprocessing.connection.Listener``
+and ``Client`` can be used.
+
+Senders are usually not meaningful in another process, so they are
+passed through ``sender_name`` before being encoded and through
+``resolve_sender`` after being decoded.  ``Anonymous`` is always
+passed as ``None`` and resolved back to ``Anonymous``.
+
+Signals re-sent by a ``BridgeReceiver`` are not forwarded again by a
+``BridgeSender`` in the same process, so two processes can bridge the
+same signals in both directions.
+"""
+
+import pickle
+import threading
+import time
+
+from louie import dispatcher
+from louie.sender import Anonymous, Any
+
+_local = threading.local()
+
+
+def _identity(value):
+    return value
+
+
+class BridgeSender(object):
+    """Forward signals to another process.
+
+    - ``connection``: The connection to write batches to.
+
+    - ``signals``: The signals to forward.
+
+    - ``sender``: Only forward signals from this sender.  Defaults to
+      ``Any``.
+
+    - ``sender_name``: Callable mapping a sender to the value sent in
+      its place.  Defaults to sending the sender itself, which then
+      must be encodable.
+
+    - ``codec``: Object with ``dumps`` and ``loads`` functions which
+      convert batches to and from bytes.  Defaults to ``pickle``.
+
+    - ``batch_size``: Number of signals collected before a batch is
+      written.
+
+    - ``latency``: Maximum number of seconds a signal waits in an
+      incomplete batch before the batch is written.
+
+    A full batch is written by the thread sending the signal which
+    completed it, so a slow reader holds up senders once the
+    connection's buffer is full.  Incomplete batches are written by a
+    background thread.
+
+    The bridge is connected with strong references, so it stays
+    connected until ``close`` is called.
+    """
+
+    def __init__(
+        self,
+        connection,
+        signals,
+        sender=Any,
+        sender_name=_identity,
+        codec=pickle,
+        batch_size=100,
+        latency=0.01,
+    ):
+        self.connection = connection
+        self.sender = sender
+        self.sender_name = sender_name
+        self.codec = codec
+        self.batch_size = batch_size
+        self.latency = latency
+        self.batches = 0
+        self.forwarded = 0
+        self._batch = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._flusher = threading.Thread(
+            target=self._run, name="louie-bridge-sender", daemon=True
+        )
+        self._flusher.start()
+        self.signals = list(signals)
+        dispatcher.connect_many(
+            (self._receive, signal, sender, False) for signal in self.signals
+        )
+
+    def flush(self):
+        """Write the current batch, if any."""
+        # Batches are taken and written under one lock, so they are
+        # written in the order they were collected.
+        with self._write_lock:
+            with self._condition:
+                batch = self._batch
+                self._batch = []
+            if batch:
+                self.connection.send_bytes(self.codec.dumps(batch))
+                self.batches += 1
+                self.forwarded += len(batch)
+
+    def close(self):
+        """Disconnect from the signals, write the current batch and
+        close the connection."""
+        dispatcher.disconnect_many(
+            (self._receive, signal, self.sender, False) for signal in self.signals
+        )
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+        self.connection.close()
+
+    def _receive(self, *arguments, **named):
+        if getattr(_local, "bridged", False):
+            # Do not echo signals received from another process.
+            return
+        signal = named.pop("signal")
+        sender = named.pop("sender")
+        if sender is Anonymous:
+            sender = None
+        else:
+            sender = self.sender_name(sender)
+        with self._condition:
+            self._batch.append((signal, sender, arguments, named))
+            if len(self._batch) < self.batch_size:
+                if len(self._batch) == 1:
+                    self._condition.notify()
+                return
+        self.flush()
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._batch or self._closed)
+                if self._closed:
+                    return
+                # Give the batch time to fill up.
+                deadline = time.monotonic() + self.latency
+                while not self._closed and self._batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    condition.wait(remaining)
+            self.flush()
+
+
+class BridgeReceiver(object):
+    """Re-send signals forwarded by a ``BridgeSender``.
+
+    - ``connection``: The connection to read batches from.
+
+    - ``resolve_sender``: Callable mapping the value sent in place of a
+      sender back to a sender.  Defaults to using the value itself.
+
+    - ``codec``: The codec used by the ``BridgeSender``.
+
+    Batches can be read with ``receive``, or by a background thread
+    started with ``start``, in which case receivers of the bridged
+    signals are called from that thread.
+    """
+
+    def __init__(self, connection, resolve_sender=_identity, codec=pickle):
+        self.connection = connection
+        self.resolve_sender = resolve_sender
+        self.codec = codec
+        self.batches = 0
+        self.received = 0
+        self._thread = None
+
+    def receive(self, timeout=None):
+        """Read one batch and send its signals.
+
+        Waits at most ``timeout`` seconds for a batch, or indefinitely
+        if ``timeout`` is ``None``.  Returns False if no batch was
+        read, and raises ``EOFError`` when the other end is closed.
+        """
+        if timeout is not None and not self.connection.poll(timeout):
+            return False
+        batch = self.codec.loads(self.connection.recv_bytes())
+        _local.bridged = True
+        try:
+            for signal, sender, arguments, named in batch:
+                if sender is None:
+                    sender = Anonymous
+                else:
+                    sender = self.resolve_sender(sender)
+                dispatcher.send(signal, sender, *arguments, **named)
+        finally:
+            _local.bridged = False
+        self.batches += 1
+        self.received += len(batch)
+        return True
+
+    def start(self):
+        """Read batches in a background thread until the other end is
+        closed."""
+        self._thread = threading.Thread(
+            target=self._run, name="louie-bridge-receiver", daemon=True
+        )
+        self._thread.start()
+
+    def join(self, timeout=None):
+        """Wait for the background thread to finish."""
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                self.receive()
+        except (EOFError, OSError):
+            pass
@@ -0,0 +1,325 @@
+"""Asynchronous delivery of signals.
+
+``EventBus.post`` queues a signal and returns immediately; the signal
+is sent later by a worker thread.  Signals posted by the same sender
+are sent one at a time, in the order they were posted, while signals
+from different senders are sent in parallel.
+
+Each sender with posted signals has its own queue.  A queue is drained
+by at most one pool task at a time, which sends up to ``batch``
+signals before making room for other senders' queues.
+
+``PriorityBus.post`` queues a signal with a priority.  A single
+dispatch thread sends queued signals lowest priority value first, and
+signals of equal priority in the order they were posted.
+
+Both buses send signals in a copy of the ``contextvars`` context of the
+code which posted them.
+"""
+
+import collections
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from louie import dispatcher, error
+from louie.mailbox import BLOCK, DROP_NEWEST
+from louie.response import Dropped, Queued
+from louie.sender import Anonymous
+from louie.signal import All
+
+
+class EventBus(object):
+    """Send posted signals from a pool of worker threads.
+
+    - ``workers``: Number of worker threads.
+
+    - ``send``: The send function to use, ``dispatcher.send`` by
+      default.  Exceptions raised by it are counted in ``errors`` and
+      their traceback is printed, as there is no sender to propagate
+      them to.
+
+    - ``batch``: Number of signals sent from one sender's queue before
+      the worker moves on.
+
+    Attributes for monitoring:
+
+    - ``pending``: Number of posted signals not yet sent.
+
+    - ``delivered``: Number of signals sent.
+
+    - ``errors``: Number of sends which raised an exception.
+    """
+
+    def __init__(self, workers=4, send=None, batch=64):
+        self.send = dispatcher.send if send is None else send
+        self.batch = batch
+        self.pending = 0
+        self.delivered = 0
+        self.errors = 0
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="louie-bus")
+        # { senderkey :
+        #   deque([(context, signal, sender, arguments, named)...]) }
+        self._queues = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def post(self, signal=All, sender=Anonymous, *arguments, **named):
+        """Queue ``signal`` to be sent from ``sender``, with the same
+        arguments as ``dispatcher.send``.
+
+        Raises ``EventBusClosedError`` after ``shutdown``.
+        """
+        call = (contextvars.copy_context(), signal, sender, arguments, named)
+        senderkey = dispatcher._sender_key(sender)
+        with self._condition:
+            if self._closed:
+                raise error.EventBusClosedError(
+                    f"Cannot post signal {signal!r} to a closed event bus"
+                )
+            self.pending += 1
+            queue = self._queues.get(senderkey)
+            if queue is not None:
+                queue.append(call)
+                return
+            self._queues[senderkey] = collections.deque([call])
+        self._executor.submit(self._drain, senderkey)
+
+    def depths(self):
+        """Return a ``{ sender : queue depth }`` dictionary for senders
+        with posted signals."""
+        with self._condition:
+            return {queue[0][2]: len(queue) for queue in self._queues.values()}
+
+    def join(self, timeout=None):
+        """Wait until all posted signals have been sent.
+
+        Returns False if ``timeout`` seconds passed first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self.pending, timeout)
+
+    def shutdown(self, drain=True):
+        """Stop accepting signals and stop the worker threads.
+
+        If ``drain`` is true, signals already posted are sent first,
+        otherwise they are discarded.
+        """
+        with self._condition:
+            self._closed = True
+            if not drain:
+                for queue in self._queues.values():
+                    self.pending -= len(queue)
+                    queue.clear()
+                self._condition.notify_all()
+        self.join()
+        self._executor.shutdown()
+
+    def _drain(self, senderkey):
+        with self._condition:
+            queue = self._queues[senderkey]
+        failed = False
+        for _ in range(self.batch):
+            try:
+                context, signal, sender, arguments, named = queue[0]
+            except IndexError:
+                # Discarded by shutdown.
+                pass
+            else:
+                try:
+                    context.run(self.send, signal, sender, *arguments, **named)
+                except Exception:
+                    failed = True
+                    traceback.print_exc()
+            with self._condition:
+                if failed:
+                    self.errors += 1
+                    failed = False
+                if queue:
+                    # The call is only removed once it is done, so that
+                    # post() sees the queue as busy until then.
+                    queue.popleft()
+                    self.pending -= 1
+                    self.delivered += 1
+                if not queue:
+                    del self._queues[senderkey]
+                    self._condition.notify_all()
+                    return
+        self._executor.submit(self._drain, senderkey)
+
+
+class PriorityBus(object):
+    """Send posted signals from a dispatch thread, by priority.
+
+    - ``capacity``: The maximum number of queued signals, or ``None``
+      for no limit.
+
+    - ``overflow``: What to do when posting to a full queue: ``BLOCK``
+      to wait for room, for at most ``timeout`` seconds if given, or
+      ``DROP_NEWEST`` to drop the signal being posted.
+
+    - ``send``: The send function to use, ``dispatcher.send`` by
+      default.  Exceptions raised by it are counted in ``errors`` and
+      their traceback is printed.
+
+    - ``clock``: Callable used to measure latencies.
+
+    Attributes for monitoring:
+
+    - ``pending``: Number of queued signals.
+
+    - ``delivered``: Number of signals sent.
+
+    - ``dropped``: Number of signals dropped because the queue was
+      full.
+
+    - ``errors``: Number of sends which raised an exception.
+    """
+
+    def __init__(
+        self,
+        capacity=None,
+        overflow=BLOCK,
+        timeout=None,
+        send=None,
+        clock=time.monotonic,
+    ):
+        if overflow not in (BLOCK, DROP_NEWEST):
+            raise ValueError(f"Unknown priority bus overflow policy {overflow!r}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.timeout = timeout
+        self.send = dispatcher.send if send is None else send
+        self.clock = clock
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        # [(priority, sequence, posted, context, signal, sender, arguments,
+        #   named)...]
+        self._heap = []
+        self._sequence = itertools.count()
+        # { priority : [count, total latency, maximum latency] }
+        self._latencies = {}
+        self._condition = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="louie-priority-bus", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self):
+        return len(self._heap)
+
+    def post(self, signal=All, sender=Anonymous, *arguments, priority=0, **named):
+        """Queue ``signal`` to be sent from ``sender`` with the given
+        ``priority``, with the same arguments as ``dispatcher.send``.
+
+        Returns ``Queued``, or ``Dropped`` if the queue was full.
+        Raises ``EventBusClosedError`` after ``shutdown``.
+        """
+        heap = self._heap
+        with self._condition:
+            if self._closed:
+                raise error.EventBusClosedError(
+                    f"Cannot post signal {signal!r} to a closed event bus"
+                )
+            if self.capacity is not None and len(heap) >= self.capacity:
+                if self.overflow == DROP_NEWEST or not self._condition.wait_for(
+                    lambda: len(heap) < self.capacity or self._closed, self.timeout
+                ):
+                    self.dropped += 1
+                    return Dropped
+                if self._closed:
+                    raise error.EventBusClosedError(
+                        f"Cannot post signal {signal!r} to a closed event bus"
+                    )
+            heapq.heappush(
+                heap,
+                (
+                    priority,
+                    next(self._sequence),
+                    self.clock(),
+                    contextvars.copy_context(),
+                    signal,
+                    sender,
+                    arguments,
+                    named,
+                ),
+            )
+            self._condition.notify_all()
+        return Queued
+
+    def latencies(self):
+        """Return a ``{ priority : (count, mean, maximum) }`` dictionary
+        of the time signals waited in the queue, for each priority."""
+        with self._condition:
+            return {
+                priority: (count, total / count, maximum)
+                for priority, (count, total, maximum) in self._latencies.items()
+            }
+
+    def join(self, timeout=None):
+        """Wait until all queued signals have been sent.
+
+        Returns False if ``timeout`` seconds passed first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._heap and not self._busy, timeout
+            )
+
+    def shutdown(self, drain=True):
+        """Stop accepting signals and stop the dispatch thread.
+
+        If ``drain`` is true, signals already queued are sent first,
+        otherwise they are discarded.
+        """
+        with self._condition:
+            self._closed = True
+            if not drain:
+                del self._heap[:]
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        heap = self._heap
+        condition = self._condition
+        while True:
+            with condition:
+                self._busy = False
+                condition.notify_all()
+                condition.wait_for(lambda: heap or self._closed)
+                if not heap:
+                    return
+                (
+                    priority,
+                    _,
+                    posted,
+                    context,
+                    signal,
+                    sender,
+                    arguments,
+                    named,
+                ) = heapq.heappop(heap)
+                self._busy = True
+                latency = self.clock() - posted
+                stats = self._latencies.get(priority)
+                if stats is None:
+                    self._latencies[priority] = [1, latency, latency]
+                else:
+                    stats[0] += 1
+                    stats[1] += latency
+                    if latency > stats[2]:
+                        stats[2] = latency
+            try:
+                context.run(self.send, signal, sender, *arguments, **named)
+            except Exception:
+                self.errors += 1
+                traceback.print_exc()
+            self.delivered += 1
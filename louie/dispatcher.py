@@ -11,7 +11,22 @@ Internal attributes:
 
 - ``connections``::
 
-    { senderkey (id) : { signal : [receivers...] } }
+    { senderkey : { signal : { receiver : Connection } } }
+
+  The key of a sender which can be weakly referenced is its id.
+  Other hashable senders, such as strings and numbers, are keyed by
+  value with ``("value", type(sender), sender)`` tuples, so equal
+  senders of the same type share their connections, ``1``, ``1.0``
+  and ``True`` do not, and a key is never reused by an unrelated
+  object.
+  Unhashable senders which cannot be weakly referenced are keyed by
+  id, and are not cleaned up.
+
+  Receivers for a given sender and signal are kept in an insertion
+  ordered dictionary, so lookup and removal of a single receiver does
+  not require a search.  The dictionary also indexes the connections
+  made with ``where`` filters by their ``(name, value)`` pairs, see
+  ``_Receivers``.
 
 - ``senders``: Used for cleaning up sender references on sender
   deletion::
@@ -19,14 +34,55 @@ Internal attributes:
     { senderkey (id) : weakref(sender) }
 
 - ``senders_back``: Used for cleaning up receiver references on receiver
-  deletion::
+  deletion, counting the signals of each sender the receiver is
+  connected to::
+
+    { receiverkey (id) : { senderkey (id) : count } }
+
+- ``typed_senders``: Sender keys of connections made with
+  ``sender_type``.  These are ``("type", id(type))`` tuples rather
+  than ids, so they never clash with the key of a sender::
+
+    { senderkey... }
+
+- ``type_routes``: Cache of the ``typed_senders`` keys that apply to
+  senders of a given type, in method resolution order::
+
+    { type : [senderkey...] }
+
+- ``circuit_breaker``: The ``CircuitBreaker`` used by ``send_robust``,
+  or ``None``.
+
+- ``value_senders``: Sender keys of senders keyed by value, ordered
+  from least to most recently used, with the time of their last use::
+
+    { senderkey : time }
+
+  Value senders never die, so their connections can be evicted by
+  limits set with ``set_sender_limits``.  ``evictions`` counts the
+  senders evicted.
 
-    { receiverkey (id) : [senderkey (id)...] }
+- ``id_routes``: Routes resolved by ``SignalRegistry`` instances for
+  senders with connections of their own, as lists indexed by signal
+  id.  Entries are dropped along with the sender's connections::
+
+    { senderkey : { registry : [(route version, route) or None...] } }
+
+- ``route_version``: Counter incremented whenever a receiver is added
+  to or removed from the tables, a connection is paused or resumed,
+  or a sender is removed, so that ``BoundSignal`` handles can tell
+  when to resolve their receivers again.
 """
 
+import collections
+import itertools
+import threading
+import time
 import weakref
 
 from louie import error, robustapply, saferef
+from louie.mailbox import BLOCK, Mailbox
+from louie.response import CircuitOpen
 from louie.sender import Anonymous, Any
 from louie.signal import All
 
@@ -60,21 +116,400 @@ connections = {}
 senders = {}
 senders_back = {}
 plugins = []
+typed_senders = set()
+type_routes = {}
+circuit_breaker = None
+value_senders = collections.OrderedDict()
+sender_limits = None
+evictions = 0
+id_routes = {}
+route_version = 0
+
+_VALUE = "value"
+_clock = time.monotonic
+# Orders connections by creation, see ``_Receivers.matching``.
+_connection_order = itertools.count()
+# Name of the send function calling the plugins' on_send hooks, per
+# thread.
+_sending = threading.local()
 
 
 def reset():
     """Reset the state of Louie.
 
     Useful during unit testing.  Should be avoided otherwise.
+
+    Receivers registered with ``louie.registry`` and not connected yet
+    are forgotten as well.
     """
-    global connections, senders, senders_back, plugins
+    from louie.registry import registry
+
+    global connections, senders, senders_back, plugins, circuit_breaker
+    global typed_senders, type_routes, value_senders, sender_limits, evictions
+    global id_routes, _clock
     connections = {}
     senders = {}
     senders_back = {}
     plugins = []
+    typed_senders = set()
+    type_routes = {}
+    circuit_breaker = None
+    value_senders = collections.OrderedDict()
+    sender_limits = None
+    evictions = 0
+    id_routes = {}
+    _clock = time.monotonic
+    registry.clear()
+    # Not restarted from 0, so existing handles see the change.
+    _routes_changed()
+
+
+def snapshot():
+    """Return a ``Snapshot`` of the routing tables and plugins, to be
+    put back with ``restore``.
+
+    Receivers, weak references and mailboxes are shared with the
+    snapshot rather than copied, so taking a snapshot costs a copy of
+    the tables' dictionaries and ``Connection`` records.
+    """
+    new_connections, new_senders, _ = _copy_tables(connections, senders)
+    # senders_back is rebuilt from the connections on restore.
+    return Snapshot(
+        new_connections,
+        new_senders,
+        list(plugins),
+        set(typed_senders),
+        collections.OrderedDict(value_senders),
+    )
+
+
+def restore(snapshot):
+    """Replace the routing tables and plugins with those of
+    ``snapshot``.
+
+    The tables are copied from the snapshot, which can be restored
+    again, and swapped in at once.  Receivers and senders which were
+    garbage collected since the snapshot was taken are left out.
+    ``Connection`` handles obtained before the restore are not
+    connected to the restored tables.
+    """
+    global connections, senders, senders_back, plugins
+    global typed_senders, type_routes, value_senders, id_routes
+    tables = _copy_tables(snapshot.connections, snapshot.senders)
+    alive = snapshot.typed_senders.intersection(tables[0])
+    values = collections.OrderedDict(
+        (senderkey, used)
+        for senderkey, used in snapshot.value_senders.items()
+        if senderkey in tables[0]
+    )
+    connections, senders, senders_back = tables
+    plugins = list(snapshot.plugins)
+    typed_senders = alive
+    type_routes = {}
+    id_routes = {}
+    value_senders = values
+    _routes_changed()
+
+
+def _copy_tables(connections, senders):
+    """Copy ``connections`` and the ``senders`` entries it uses,
+    leaving out dead senders and receivers, and rebuild
+    ``senders_back``.
+
+    Returns a ``(connections, senders, senders_back)`` tuple.
+    """
+    new_connections = {}
+    new_senders = {}
+    new_senders_back = {}
+    for senderkey, signals in connections.items():
+        weak_sender = senders.get(senderkey)
+        if weak_sender is not None and weak_sender() is None:
+            continue
+        new_signals = {}
+        for signal, receivers in signals.items():
+            new_receivers = receivers.live_copy()
+            if not new_receivers:
+                continue
+            new_signals[signal] = new_receivers
+            for receiver in new_receivers:
+                back = new_senders_back.setdefault(id(receiver), {})
+                back[senderkey] = back.get(senderkey, 0) + 1
+        if new_signals:
+            new_connections[senderkey] = new_signals
+            if weak_sender is not None:
+                new_senders[senderkey] = weak_sender
+    return new_connections, new_senders, new_senders_back
+
+
+class Connection(object):
+    """Handle for a single connection made by ``connect``.
+
+    A ``Connection`` is the record stored in the routing tables for a
+    receiver, so operations through the handle do not need to rebuild a
+    safe reference for the receiver or search for it.
+
+    Attributes:
+
+    - ``receiver``: The receiver (or the weak reference to it) as stored
+      in the routing tables.
+
+    - ``signal``: The signal the receiver is connected to.
+
+    - ``senderkey``: The key of the sender the receiver is connected to.
+
+    - ``paused``: Whether delivery to the receiver is suspended.
+
+    - ``mailbox``: The ``Mailbox`` calls to the receiver are queued in,
+      or ``None`` if the receiver is called directly.
+
+    - ``where``: The ``{ name : value }`` filter of the connection, or
+      ``None``.
+
+    - ``batch``: Whether the receiver takes whole columns from
+      ``send_batch``.
+
+    Connections can be used as context managers, in which case the
+    receiver is disconnected when the ``with`` block exits.
+    """
+
+    __slots__ = (
+        "receiver",
+        "signal",
+        "senderkey",
+        "paused",
+        "mailbox",
+        "where",
+        "batch",
+        "_order",
+    )
+
+    def __init__(self, receiver, signal, senderkey, where=None):
+        self.receiver = receiver
+        self.signal = signal
+        self.senderkey = senderkey
+        self.paused = False
+        self.mailbox = None
+        self.where = where
+        self.batch = False
+        self._order = next(_connection_order)
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} receiver={self.receiver!r} "
+            f"signal={self.signal!r}>"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.connected:
+            self.disconnect()
+
+    @property
+    def connected(self):
+        """Whether this connection is still present in the routing
+        tables."""
+        try:
+            receivers = connections[self.senderkey][self.signal]
+            return receivers.get(self.receiver) is self
+        except (KeyError, TypeError):
+            return False
+
+    def disconnect(self):
+        """Disconnect the receiver, like ``dispatcher.disconnect``.
+
+        May raise ``DispatcherKeyError`` if the connection has already
+        been removed.
+        """
+        if not self.connected:
+            raise error.DispatcherKeyError(f"{self!r} is not connected")
+        receivers = connections[self.senderkey][self.signal]
+        _remove_old_back_refs(self.senderkey, self.signal, self.receiver, receivers)
+        _cleanup_connections(self.senderkey, self.signal)
+        # Update stats.
+        if __debug__:
+            global disconnects
+            disconnects += 1
+
+    def pause(self):
+        """Suspend delivery to the receiver without disconnecting it."""
+        self.paused = True
+        _routes_changed()
+
+    def resume(self):
+        """Resume delivery to a paused receiver."""
+        self.paused = False
+        _routes_changed()
+
+
+class _Receivers(dict):
+    """Receivers of one sender and signal::
+
+        { receiver : Connection }
+
+    The ``index`` attribute maps each ``(name, value)`` pair used in
+    the ``where`` filter of a connection to the connections using it::
+
+        { (name, value) : {Connection...} }
+
+    The ``unfiltered`` attribute holds the connections without a
+    filter, in the order they were made::
+
+        { receiver : Connection }
+    """
+
+    __slots__ = ("index", "unfiltered")
+
+    def __init__(self):
+        self.index = {}
+        self.unfiltered = {}
+
+    def matching(self, named):
+        """Return the connections whose filters match ``named``, in the
+        order they were made.
+
+        A connection matches if each pair of its filter is found in
+        ``named``, which is counted with one index lookup per named
+        argument, so connections whose filters do not match are never
+        visited.
+        """
+        index = self.index
+        if not index:
+            return list(self.values())
+        hits = {}
+        for item in named.items():
+            try:
+                connections_ = index.get(item)
+            except TypeError:
+                # Unhashable values can not match any filter.
+                continue
+            if connections_:
+                for connection in connections_:
+                    hits[connection] = hits.get(connection, 0) + 1
+        matched = [
+            connection
+            for connection, count in hits.items()
+            if count == len(connection.where)
+        ]
+        if not matched:
+            return list(self.unfiltered.values())
+        matched.extend(self.unfiltered.values())
+        matched.sort(key=_order)
+        return matched
+
+    def add(self, receiver, connection):
+        self[receiver] = connection
+        _routes_changed()
+        if connection.where is None:
+            self.unfiltered[receiver] = connection
+        else:
+            for item in connection.where.items():
+                self.index.setdefault(item, set()).add(connection)
+
+    def remove(self, receiver):
+        """Remove and return the connection of ``receiver``."""
+        connection = self.pop(receiver)
+        _routes_changed()
+        if connection.where is None:
+            del self.unfiltered[receiver]
+        else:
+            for item in connection.where.items():
+                connections_ = self.index[item]
+                connections_.discard(connection)
+                if not connections_:
+                    del self.index[item]
+        return connection
+
+    def remove_many(self, receivers):
+        """Remove and return the connections of ``receivers`` which are
+        present."""
+        removed = []
+        unfiltered = self.unfiltered
+        for receiver in receivers:
+            connection = self.pop(receiver, None)
+            if connection is not None:
+                removed.append(connection)
+                if connection.where is None:
+                    del unfiltered[receiver]
+        if not removed:
+            return removed
+        _routes_changed()
+        index = self.index
+        if index:
+            for connection in removed:
+                if connection.where is not None:
+                    for item in connection.where.items():
+                        connections_ = index[item]
+                        connections_.discard(connection)
+                        if not connections_:
+                            del index[item]
+        return removed
+
+    def live_copy(self):
+        """Return a copy holding copies of the connections, leaving out
+        receivers which were garbage collected."""
+        receivers = _Receivers()
+        for receiver, connection in self.items():
+            if isinstance(receiver, WEAKREF_TYPES) and receiver() is None:
+                continue
+            copy = Connection(
+                receiver, connection.signal, connection.senderkey, connection.where
+            )
+            copy.paused = connection.paused
+            copy.mailbox = connection.mailbox
+            copy.batch = connection.batch
+            copy._order = connection._order
+            receivers[receiver] = copy
+            if copy.where is None:
+                receivers.unfiltered[receiver] = copy
+            else:
+                for item in copy.where.items():
+                    receivers.index.setdefault(item, set()).add(copy)
+        return receivers
+
+
+def _order(connection):
+    return connection._order
+
 
+class Snapshot(object):
+    """Routing tables and plugins captured by ``snapshot``.
 
-def connect(receiver, signal=All, sender=Any, weak=True):
+    Weak references to senders and receivers are kept as weak
+    references, so a snapshot does not keep them alive.
+    """
+
+    __slots__ = ("connections", "senders", "plugins", "typed_senders", "value_senders")
+
+    def __init__(self, connections, senders, plugins, typed_senders, value_senders):
+        self.connections = connections
+        self.senders = senders
+        self.plugins = plugins
+        self.typed_senders = typed_senders
+        self.value_senders = value_senders
+
+    def __len__(self):
+        """Return the number of connections."""
+        return sum(
+            len(receivers)
+            for signals in self.connections.values()
+            for receivers in signals.values()
+        )
+
+
+def connect(
+    receiver,
+    signal=All,
+    sender=Any,
+    weak=True,
+    mailbox=None,
+    overflow=BLOCK,
+    timeout=None,
+    sender_type=None,
+    where=None,
+    batch=False,
+):
     """Connect ``receiver`` to ``sender`` for ``signal``.
 
     - ``receiver``: A callable Python object which is to receive
@@ -121,57 +556,119 @@ def connect(receiver, signal=All, sender=Any, weak=True):
       the receiver objects.  If this parameter is ``False``, then strong
       references will be used.
 
-    Returns ``None``, may raise ``DispatcherTypeError``.
+    - ``mailbox``: If given, the maximum number of calls to queue for
+      the receiver.  Sends then only queue calls in a ``Mailbox``, and
+      a worker thread makes them, so a slow receiver does not delay
+      the sender.  The response for the receiver is ``Queued``, or
+      ``Dropped`` if the call was dropped.
+
+    - ``overflow``: What to do when the mailbox is full, one of the
+      policies in ``louie.mailbox``: ``BLOCK`` (the default) waits for
+      room, for at most ``timeout`` seconds if given; ``DROP_OLDEST``
+      drops the oldest queued call and ``DROP_NEWEST`` drops the new
+      call.
+
+    - ``sender_type``: If given, instead of a single ``sender``, the
+      receiver responds to signals from any instance of this type or
+      of its subclasses.
+
+    - ``where``: If given, a ``{ name : value }`` dictionary.  The
+      receiver is then only called by sends whose named arguments
+      include all of these names with equal values.  Values must be
+      hashable.  Filters are indexed, so adding narrowly filtered
+      receivers to a signal does not slow down sends which they do
+      not match.
+
+    - ``batch``: If true, ``send_batch`` calls the receiver once with
+      whole columns of values, rather than once per row.  Other sends
+      call it as usual.
+
+    Returns a ``Connection`` handle for the new connection, may raise
+    ``DispatcherTypeError``.  The handle can be ignored; it is only
+    needed to use the cheaper ``Connection.disconnect``,
+    ``Connection.pause`` and ``Connection.resume`` operations.
     """
     if signal is None:
         raise error.DispatcherTypeError(
             f"Signal cannot be None (receiver={receiver!r} sender={sender!r})"
         )
+    if where is not None:
+        where = dict(where)
+        try:
+            hash(tuple(where.items()))
+        except TypeError:
+            raise error.DispatcherTypeError(
+                f"Filter values must be hashable (receiver={receiver!r} "
+                f"where={where!r})"
+            )
+    # Keep the target alive until its reference is in the tables, as a
+    # dead weakref that was never hashed can not be hashed.
+    target = receiver
     if weak:
         receiver = saferef.safe_ref(receiver, on_delete=_remove_receiver)
-    senderkey = id(sender)
-    if senderkey in connections:
-        signals = connections[senderkey]
+    if sender_type is None:
+        senderkey, signals = _get_signals(sender)
+    elif sender is not Any:
+        raise error.DispatcherTypeError(
+            f"Cannot connect to both sender {sender!r} and "
+            f"sender type {sender_type!r} (receiver={receiver!r})"
+        )
     else:
-        connections[senderkey] = signals = {}
-    # Keep track of senders for cleanup.
-    # Is Anonymous something we want to clean up?
-    if sender not in (None, Anonymous, Any):
-
-        def remove(object, senderkey=senderkey):
-            _remove_sender(senderkey=senderkey)
-
-        # Skip objects that can not be weakly referenced, which means
-        # they won't be automatically cleaned up, but that's too bad.
-        try:
-            weak_sender = weakref.ref(sender, remove)
-            senders[senderkey] = weak_sender
-        except Exception:
-            pass
-    receiver_id = id(receiver)
-    # get current set, remove any current references to
-    # this receiver in the set, including back-references
+        senderkey, signals = _get_signals(sender_type, _type_key(sender_type))
+        if senderkey not in typed_senders:
+            typed_senders.add(senderkey)
+            type_routes.clear()
     if signal in signals:
         receivers = signals[signal]
-        _remove_old_back_refs(senderkey, signal, receiver, receivers)
     else:
-        receivers = signals[signal] = []
-    try:
-        current = senders_back.get(receiver_id)
-        if current is None:
-            senders_back[receiver_id] = current = []
-        if senderkey not in current:
-            current.append(senderkey)
-    except Exception:
-        pass
-    receivers.append(receiver)
+        receivers = signals[signal] = _Receivers()
+    connection = _add_receiver(receiver, signal, senderkey, receivers, where)
+    del target
+    if mailbox is not None:
+        connection.mailbox = Mailbox(mailbox, overflow, timeout)
+    connection.batch = batch
     # Update stats.
     if __debug__:
         global connects
         connects += 1
+    return connection
+
+
+def connect_many(specs):
+    """Connect many receivers in one pass over the routing tables.
+
+    - ``specs``: Iterable of ``(receiver, signal, sender, weak)``
+      tuples, with the same meaning as the arguments to ``connect``.
+      Trailing items may be omitted to use ``connect``'s defaults.
 
+    Specs are grouped by sender and signal so that each sender is
+    tracked and each signal table is looked up only once.  All specs
+    are validated before any connection is made.
 
-def disconnect(receiver, signal=All, sender=Any, weak=True):
+    Returns a list of ``Connection`` handles in the order of ``specs``,
+    may raise ``DispatcherTypeError``.
+    """
+    specs = [_connect_spec(*spec) for spec in specs]
+    result = [None] * len(specs)
+    for sender, by_signal in _group_specs(specs).values():
+        senderkey, signals = _get_signals(sender)
+        for signal, items in by_signal.items():
+            if signal in signals:
+                receivers = signals[signal]
+            else:
+                receivers = signals[signal] = _Receivers()
+            for index, receiver, weak in items:
+                if weak:
+                    receiver = saferef.safe_ref(receiver, on_delete=_remove_receiver)
+                result[index] = _add_receiver(receiver, signal, senderkey, receivers)
+    # Update stats.
+    if __debug__:
+        global connects
+        connects += len(result)
+    return result
+
+
+def disconnect(receiver, signal=All, sender=Any, weak=True, sender_type=None):
     """Disconnect ``receiver`` from ``sender`` for ``signal``.
 
     - ``receiver``: The registered receiver to disconnect.
@@ -182,6 +679,8 @@ def disconnect(receiver, signal=All, sender=Any, weak=True):
 
     - ``weak``: The weakref state to disconnect.
 
+    - ``sender_type``: The registered sender type to disconnect.
+
     ``disconnect`` reverses the process of ``connect``, the semantics for
     the individual elements are logically equivalent to a tuple of
     ``(receiver, signal, sender, weak)`` used as a key to be deleted
@@ -202,7 +701,10 @@ def disconnect(receiver, signal=All, sender=Any, weak=True):
         )
     if weak:
         receiver = saferef.safe_ref(receiver)
-    senderkey = id(sender)
+    if sender_type is None:
+        senderkey = _sender_key(sender)
+    else:
+        senderkey = _type_key(sender_type)
     try:
         signals = connections[senderkey]
         receivers = signals[signal]
@@ -225,6 +727,96 @@ def disconnect(receiver, signal=All, sender=Any, weak=True):
         disconnects += 1
 
 
+def disconnect_many(specs):
+    """Disconnect many receivers in one pass over the routing tables.
+
+    - ``specs``: Iterable of ``(receiver, signal, sender, weak)``
+      tuples, as for ``connect_many``.
+
+    All specs are validated before any connection is removed.
+
+    Returns ``None``, may raise ``DispatcherTypeError`` or
+    ``DispatcherKeyError``.
+    """
+    specs = [_connect_spec(*spec) for spec in specs]
+    groups = _group_specs(specs)
+    for senderkey, (sender, by_signal) in groups.items():
+        for signal in by_signal:
+            if signal not in connections.get(senderkey, ()):
+                raise error.DispatcherKeyError(
+                    f"No receivers found for signal {signal!r} from sender {sender!r}"
+                )
+    for senderkey, (sender, by_signal) in groups.items():
+        for signal, items in by_signal.items():
+            try:
+                receivers = connections[senderkey][signal]
+            except KeyError:
+                # Already cleaned up by a receiver or sender deletion.
+                continue
+            targets = [
+                saferef.safe_ref(receiver) if weak else receiver
+                for index, receiver, weak in items
+            ]
+            _remove_connections(senderkey, receivers, targets)
+            _cleanup_connections(senderkey, signal)
+    # Update stats.
+    if __debug__:
+        global disconnects
+        disconnects += len(specs)
+
+
+def disconnect_all(signal=None, sender=None, receiver=None, weak=True):
+    """Disconnect every connection matching the given criteria.
+
+    - ``signal``: Only disconnect receivers connected to this signal.
+
+    - ``sender``: Only disconnect receivers connected to this sender.
+
+    - ``receiver``: Only disconnect this receiver.
+
+    - ``weak``: The weakref state of ``receiver``, as for
+      ``disconnect``.
+
+    Criteria left as ``None`` match everything, so calling
+    ``disconnect_all()`` without arguments removes all connections but
+    leaves installed plugins in place.
+
+    Returns the number of connections removed.
+    """
+    if receiver is not None and weak:
+        receiver = saferef.safe_ref(receiver)
+    if sender is None:
+        senderkeys = list(connections)
+    else:
+        senderkeys = [_sender_key(sender)]
+    count = 0
+    for senderkey in senderkeys:
+        signals = connections.get(senderkey)
+        if signals is None:
+            continue
+        if signal is None:
+            matching = list(signals)
+        elif signal in signals:
+            matching = [signal]
+        else:
+            continue
+        for sig in matching:
+            receivers = signals[sig]
+            if receiver is None:
+                targets = list(receivers)
+            elif receiver in receivers:
+                targets = [receiver]
+            else:
+                continue
+            count += _remove_connections(senderkey, receivers, targets)
+            _cleanup_connections(senderkey, sig)
+    # Update stats.
+    if __debug__:
+        global disconnects
+        disconnects += count
+    return count
+
+
 def get_receivers(sender=Any, signal=All):
     """Get list of receivers from global tables.
 
@@ -240,9 +832,25 @@ def get_receivers(sender=Any, signal=All):
     retrieve the actual receiver objects as an iterable object.
     """
     try:
-        return connections[id(sender)][signal]
+        return connections[_sender_key(sender)][signal]
+    except KeyError:
+        return []
+
+
+def _get_connections(senderkey, signal, named=None):
+    """Get a copy of the ``Connection`` records for the given
+    ``senderkey`` and ``signal`` pair.
+
+    If ``named`` is given, only connections whose ``where`` filter
+    matches these named arguments are included.
+    """
+    try:
+        receivers = connections[senderkey][signal]
     except KeyError:
         return []
+    if named is None:
+        return list(receivers.values())
+    return receivers.matching(named)
 
 
 def live_receivers(receivers):
@@ -253,19 +861,34 @@ def live_receivers(receivers):
     all live receivers.
     """
     for receiver in receivers:
-        if isinstance(receiver, WEAKREF_TYPES):
-            # Dereference the weak reference.
-            receiver = receiver()
+        receiver = _live(receiver)
         if receiver is not None:
-            # Check installed plugins to make sure this receiver is
-            # live.
-            live = True
-            for plugin in plugins:
-                if not plugin.is_live(receiver):
-                    live = False
-                    break
-            if live:
-                yield receiver
+            yield receiver
+
+
+def _live_connections(records):
+    """Like ``live_receivers``, but for ``Connection`` records.
+
+    Produces ``(connection, receiver)`` pairs.
+    """
+    for connection in records:
+        receiver = _live(connection.receiver)
+        if receiver is not None:
+            yield connection, receiver
+
+
+def _live(receiver):
+    """Resolve ``receiver``, returning ``None`` if it is not live."""
+    if isinstance(receiver, WEAKREF_TYPES):
+        # Dereference the weak reference.
+        receiver = receiver()
+    if receiver is not None:
+        # Check installed plugins to make sure this receiver is
+        # live.
+        for plugin in plugins:
+            if not plugin.is_live(receiver):
+                return None
+    return receiver
 
 
 def get_all_receivers(sender=Any, signal=All):
@@ -275,26 +898,50 @@ def get_all_receivers(sender=Any, signal=All):
     sender, each receiver should be produced only once by the
     resulting generator.
     """
-    yielded = set()
-    for receivers in (
+    for connection in _get_all_connections(sender, signal):
+        yield connection.receiver
+
+
+def _get_all_connections(sender, signal, named=None):
+    """Like ``get_all_receivers``, but produce the ``Connection``
+    records of the receivers, skipping paused connections.
+
+    If ``named`` is given, connections whose ``where`` filter does not
+    match these named arguments are skipped too.
+    """
+    senderkey = _sender_key(sender)
+    if sender_limits is not None:
+        _use_sender(senderkey)
+    anykey = id(Any)
+    sources = [
         # Get receivers that receive *this* signal from *this* sender.
-        get_receivers(sender, signal),
+        _get_connections(senderkey, signal, named),
         # Add receivers that receive *all* signals from *this* sender.
-        get_receivers(sender, All),
-        # Add receivers that receive *this* signal from *any* sender.
-        get_receivers(Any, signal),
-        # Add receivers that receive *all* signals from *any* sender.
-        get_receivers(Any, All),
-    ):
-        # Make a copy of each list so it's immutable within the context
-        # of this function, even if a receiver calls disconnect() or any
+        _get_connections(senderkey, All, named),
+    ]
+    if typed_senders and sender is not Anonymous and sender is not Any:
+        # Add receivers that receive *this* or *all* signals from
+        # senders of the type of *this* sender.
+        for typekey in _get_type_keys(sender):
+            sources.append(_get_connections(typekey, signal, named))
+            sources.append(_get_connections(typekey, All, named))
+    # Add receivers that receive *this* signal from *any* sender.
+    sources.append(_get_connections(anykey, signal, named))
+    # Add receivers that receive *all* signals from *any* sender.
+    sources.append(_get_connections(anykey, All, named))
+    yielded = set()
+    for receivers in sources:
+        # Each list is a copy, so it's immutable within the context of
+        # this function, even if a receiver calls disconnect() or any
         # other function that changes a list of receivers.
-        for receiver in list(receivers):
-            if receiver:  # filter out dead instance-method weakrefs
+        for connection in receivers:
+            receiver = connection.receiver
+            if receiver and not connection.paused:
+                # filter out dead instance-method weakrefs
                 try:
                     if receiver not in yielded:
                         yielded.add(receiver)
-                        yield receiver
+                        yield connection
                 except TypeError:
                     # dead weakrefs raise TypeError on hash...
                     pass
@@ -335,20 +982,29 @@ def send(signal=All, sender=Anonymous, *arguments, **named):
     # Call each receiver with whatever arguments it can accept.
     # Return a list of tuple pairs [(receiver, response), ... ].
     responses = []
-    for receiver in live_receivers(get_all_receivers(sender, signal)):
-        # Wrap receiver using installed plugins.
-        original = receiver
-        for plugin in plugins:
-            receiver = plugin.wrap_receiver(receiver)
-        response = robustapply.robust_apply(
-            receiver, original, signal=signal, sender=sender, *arguments, **named
-        )
-        responses.append((receiver, response))
-    # Update stats.
-    if __debug__:
-        global sends
-        sends += 1
-    return responses
+    hooked = None
+    if plugins:
+        hooked = _on_send("send", signal, sender, arguments, named)
+    try:
+        named["signal"] = signal
+        named["sender"] = sender
+        for connection, receiver in _live_connections(
+            _get_all_connections(sender, signal, named)
+        ):
+            # Wrap receiver using installed plugins.
+            original = receiver
+            for plugin in plugins:
+                receiver = plugin.wrap_receiver(receiver)
+            response = _apply(connection, receiver, original, arguments, named)
+            responses.append((receiver, response))
+        # Update stats.
+        if __debug__:
+            global sends
+            sends += 1
+        return responses
+    finally:
+        if hooked:
+            _on_send_end(hooked, signal, sender)
 
 
 def send_minimal(signal=All, sender=Anonymous, *arguments, **named):
@@ -357,18 +1013,27 @@ def send_minimal(signal=All, sender=Anonymous, *arguments, **named):
     # Call each receiver with whatever arguments it can accept.
     # Return a list of tuple pairs [(receiver, response), ... ].
     responses = []
-    for receiver in live_receivers(get_all_receivers(sender, signal)):
-        # Wrap receiver using installed plugins.
-        original = receiver
-        for plugin in plugins:
-            receiver = plugin.wrap_receiver(receiver)
-        response = robustapply.robust_apply(receiver, original, *arguments, **named)
-        responses.append((receiver, response))
-    # Update stats.
-    if __debug__:
-        global sends
-        sends += 1
-    return responses
+    hooked = None
+    if plugins:
+        hooked = _on_send("send_minimal", signal, sender, arguments, named)
+    try:
+        for connection, receiver in _live_connections(
+            _get_all_connections(sender, signal, named)
+        ):
+            # Wrap receiver using installed plugins.
+            original = receiver
+            for plugin in plugins:
+                receiver = plugin.wrap_receiver(receiver)
+            response = _apply(connection, receiver, original, arguments, named)
+            responses.append((receiver, response))
+        # Update stats.
+        if __debug__:
+            global sends
+            sends += 1
+        return responses
+    finally:
+        if hooked:
+            _on_send_end(hooked, signal, sender)
 
 
 def send_exact(signal=All, sender=Anonymous, *arguments, **named):
@@ -379,16 +1044,28 @@ def send_exact(signal=All, sender=Anonymous, *arguments, **named):
     for a particular signal on a particular sender.
     """
     responses = []
-    for receiver in live_receivers(get_receivers(sender, signal)):
-        # Wrap receiver using installed plugins.
-        original = receiver
-        for plugin in plugins:
-            receiver = plugin.wrap_receiver(receiver)
-        response = robustapply.robust_apply(
-            receiver, original, signal=signal, sender=sender, *arguments, **named
-        )
-        responses.append((receiver, response))
-    return responses
+    hooked = None
+    if plugins:
+        hooked = _on_send("send_exact", signal, sender, arguments, named)
+    try:
+        named["signal"] = signal
+        named["sender"] = sender
+        records = [
+            connection
+            for connection in _get_connections(_sender_key(sender), signal, named)
+            if not connection.paused
+        ]
+        for connection, receiver in _live_connections(records):
+            # Wrap receiver using installed plugins.
+            original = receiver
+            for plugin in plugins:
+                receiver = plugin.wrap_receiver(receiver)
+            response = _apply(connection, receiver, original, arguments, named)
+            responses.append((receiver, response))
+        return responses
+    finally:
+        if hooked:
+            _on_send_end(hooked, signal, sender)
 
 
 def send_robust(signal=All, sender=Anonymous, *arguments, **named):
@@ -423,32 +1100,489 @@ def send_robust(signal=All, sender=Anonymous, *arguments, **named):
     If any receiver raises an error (specifically, any subclass of
     ``Exception``), the error instance is returned as the result for
     that receiver.
+
+    If a circuit breaker is installed with ``install_circuit_breaker``,
+    receivers whose circuit is open are not called, and ``CircuitOpen``
+    is returned as their result.
     """
     # Call each receiver with whatever arguments it can accept.
     # Return a list of tuple pairs [(receiver, response), ... ].
     responses = []
-    for receiver in live_receivers(get_all_receivers(sender, signal)):
-        original = receiver
-        for plugin in plugins:
-            receiver = plugin.wrap_receiver(receiver)
-        try:
-            response = robustapply.robust_apply(
-                receiver, original, signal=signal, sender=sender, *arguments, **named
-            )
-        except Exception as err:
-            responses.append((receiver, err))
+    hooked = None
+    if plugins:
+        hooked = _on_send("send_robust", signal, sender, arguments, named)
+    try:
+        named["signal"] = signal
+        named["sender"] = sender
+        breaker = circuit_breaker
+        for connection, receiver in _live_connections(
+            _get_all_connections(sender, signal, named)
+        ):
+            original = receiver
+            for plugin in plugins:
+                receiver = plugin.wrap_receiver(receiver)
+            if breaker is not None and not breaker.allow(connection.receiver):
+                responses.append((receiver, CircuitOpen))
+                continue
+            try:
+                response = _apply(connection, receiver, original, arguments, named)
+            except Exception as err:
+                if breaker is not None:
+                    breaker.failure(connection.receiver)
+                responses.append((receiver, err))
+            else:
+                if breaker is not None:
+                    breaker.success(connection.receiver)
+                responses.append((receiver, response))
+        return responses
+    finally:
+        if hooked:
+            _on_send_end(hooked, signal, sender)
+
+
+def send_function():
+    """Return the name of the send function, such as ``"send"`` or
+    ``"send_robust"``, whose call of the plugins' ``on_send`` hooks is
+    in progress in this thread, or ``None``."""
+    return getattr(_sending, "function", None)
+
+
+def _on_send(function, signal, sender, arguments, named):
+    """Call the ``on_send`` hook of the plugins for a send made by the
+    send function named ``function``.
+
+    Returns the plugins called, for ``_on_send_end``.
+    """
+    hooked = tuple(plugins)
+    previous = getattr(_sending, "function", None)
+    _sending.function = function
+    try:
+        for plugin in hooked:
+            plugin.on_send(signal, sender, arguments, named)
+    finally:
+        _sending.function = previous
+    return hooked
+
+
+def _on_send_end(hooked, signal, sender):
+    """Call the ``on_send_end`` hook of the plugins ``hooked`` by
+    ``_on_send``."""
+    for plugin in hooked:
+        plugin.on_send_end(signal, sender)
+
+
+def set_sender_limits(max_senders=None, ttl=None, clock=time.monotonic):
+    """Limit the connections of senders keyed by value.
+
+    - ``max_senders``: Maximum number of value senders with
+      connections.  When exceeded, the connections of the least
+      recently used sender are removed.
+
+    - ``ttl``: Seconds after the last connect or send of a value sender
+      after which its connections are removed.
+
+    - ``clock``: Monotonic clock callable, in seconds.
+
+    Calling with no limits removes them.  Expired senders are evicted
+    when value senders are connected or used.  Returns the number of
+    senders evicted right away.
+    """
+    global sender_limits, _clock
+    _clock = clock
+    if max_senders is None and ttl is None:
+        sender_limits = None
+        return 0
+    sender_limits = (max_senders, ttl)
+    return _evict_senders()
+
+
+def bind(signal=All, sender=Anonymous):
+    """Return a ``BoundSignal`` handle sending ``signal`` from
+    ``sender``."""
+    if signal is None:
+        raise error.DispatcherTypeError(f"Signal cannot be None (sender={sender!r})")
+    return BoundSignal(signal, sender)
+
+
+class BoundSignal(object):
+    """Handle for sending one signal from one sender, returned by
+    ``bind``.
+
+    Calling the handle with named arguments is equivalent to calling
+    ``send(signal, sender, **named)``, but the receivers are looked up
+    and their signatures analyzed only when the routing tables change,
+    as told by ``route_version``, rather than on every call.
+
+    The handle holds a strong reference to its sender.  When plugins
+    are installed, when positional arguments are given, or when a
+    receiver was connected with a ``where`` filter, calls fall back to
+    ``send``.
+    """
+
+    __slots__ = ("signal", "sender", "_version", "_route")
+
+    def __init__(self, signal, sender):
+        self.signal = signal
+        self.sender = sender
+        self._version = None
+        # [(connection, receiver or weak reference, weak, accepted names)...]
+        # or None to fall back to send.
+        self._route = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.signal!r} from {self.sender!r}>"
+
+    def __call__(self, *arguments, **named):
+        if arguments or plugins:
+            return send(self.signal, self.sender, *arguments, **named)
+        if sender_limits is not None:
+            # May evict the sender, changing the route.
+            _use_sender(_sender_key(self.sender))
+        if self._version != route_version:
+            self._version = route_version
+            self._route = _resolve_route(self.sender, self.signal)
+        if self._route is None:
+            return send(self.signal, self.sender, **named)
+        return _send_route(self._route, self.signal, self.sender, named)
+
+
+def _resolve_route(sender, signal):
+    """Return the receivers of ``signal`` from ``sender`` for
+    ``_send_route``, as ``(connection, receiver or weak reference, weak,
+    accepted names)`` tuples, or ``None`` if the route has ``where``
+    filters and must be sent through ``send``."""
+    route = []
+    for connection in _get_all_connections(sender, signal):
+        if connection.where is not None:
+            return None
+        reference = connection.receiver
+        weak = isinstance(reference, WEAKREF_TYPES)
+        receiver = reference() if weak else reference
+        if receiver is None:
+            continue
+        route.append(
+            (connection, reference, weak, robustapply.accepted_names(receiver))
+        )
+    return route
+
+
+def _send_route(route, signal, sender, named):
+    """Call the receivers of a route made by ``_resolve_route``, like
+    ``send`` without plugins or positional arguments."""
+    named["signal"] = signal
+    named["sender"] = sender
+    responses = []
+    for connection, receiver, weak, accepted in route:
+        if weak:
+            receiver = receiver()
+            if receiver is None:
+                continue
+        if connection.mailbox is not None:
+            response = connection.mailbox.put(receiver, receiver, (), named)
+        elif accepted is None:
+            response = receiver(**named)
         else:
-            responses.append((receiver, response))
+            response = receiver(
+                **{name: value for name, value in named.items() if name in accepted}
+            )
+        responses.append((receiver, response))
+    # Update stats.
+    if __debug__:
+        global sends
+        sends += 1
     return responses
 
 
+def send_batch(signal=All, sender=Anonymous, *arguments, **columns):
+    """Send ``signal`` from ``sender`` for a batch of rows of values.
+
+    - ``columns``: Named arguments whose values are sequences of equal
+      length, holding one value per row.
+
+    Receivers connected with ``batch=True`` are called once with the
+    whole columns.  Other receivers are called once per row, with the
+    values of the row, as if sent separately.  ``arguments``, ``signal``
+    and ``sender`` are passed unchanged to every call.
+
+    A receiver with a ``where`` filter is only given the matching rows;
+    for a batch receiver, the columns are then lists of the values of
+    these rows.
+
+    Return a list of ``(receiver, response)`` pairs, where the response
+    of a receiver called per row is the list of its responses.  Raises
+    ``ValueError`` if the columns are missing or of different lengths.
+    """
+    if not columns:
+        raise ValueError(f"No columns given in batch of signal {signal!r}")
+    lengths = {name: len(column) for name, column in columns.items()}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Columns of different lengths {lengths!r}")
+    responses = []
+    hooked = None
+    if plugins:
+        hooked = _on_send("send_batch", signal, sender, arguments, columns)
+    try:
+        rows = None
+        for connection, receiver in _live_connections(
+            _get_all_connections(sender, signal)
+        ):
+            # Wrap receiver using installed plugins.
+            original = receiver
+            for plugin in plugins:
+                receiver = plugin.wrap_receiver(receiver)
+            where = connection.where
+            if connection.batch:
+                if where is None:
+                    named = dict(columns)
+                else:
+                    named = _select_rows(columns, where)
+                    if named is None:
+                        continue
+                named["signal"] = signal
+                named["sender"] = sender
+                response = _apply(connection, receiver, original, arguments, named)
+            else:
+                if rows is None:
+                    rows = [
+                        dict(zip(columns, values)) for values in zip(*columns.values())
+                    ]
+                response = []
+                for row in rows:
+                    if where is not None and not _where_matches(where, row):
+                        continue
+                    named = dict(row)
+                    named["signal"] = signal
+                    named["sender"] = sender
+                    response.append(
+                        _apply(connection, receiver, original, arguments, named)
+                    )
+                if where is not None and not response:
+                    continue
+            responses.append((receiver, response))
+        # Update stats.
+        if __debug__:
+            global sends
+            sends += 1
+        return responses
+    finally:
+        if hooked:
+            _on_send_end(hooked, signal, sender)
+
+
+def install_circuit_breaker(breaker):
+    """Use ``breaker``, a ``CircuitBreaker``, in ``send_robust``.
+
+    Receivers that keep failing are then skipped by ``send_robust``
+    for a cooldown period, and get ``CircuitOpen`` as their response.
+    Only one circuit breaker is used at a time; installing another
+    replaces it.
+    """
+    global circuit_breaker
+    circuit_breaker = breaker
+
+
+def remove_circuit_breaker():
+    """Stop using the installed circuit breaker in ``send_robust``."""
+    global circuit_breaker
+    circuit_breaker = None
+
+
+def _apply(connection, receiver, signature, arguments, named):
+    """Call ``receiver`` with ``arguments`` and the acceptable subset of
+    ``named``, or queue the call if the connection has a mailbox."""
+    if connection.mailbox is not None:
+        return connection.mailbox.put(receiver, signature, arguments, named)
+    return robustapply.robust_apply(receiver, signature, *arguments, **named)
+
+
+def _sender_key(sender):
+    """Return the key of ``sender`` in the routing tables."""
+    if type(sender).__weakrefoffset__:
+        return id(sender)
+    try:
+        hash(sender)
+    except TypeError:
+        return id(sender)
+    return (_VALUE, type(sender), sender)
+
+
+def _use_sender(senderkey):
+    """Record a use of ``senderkey`` if it is a value sender."""
+    if senderkey in value_senders:
+        _touch_sender(senderkey)
+
+
+def _touch_sender(senderkey):
+    """Record a use of the value sender ``senderkey``, evicting it
+    first if it expired."""
+    ttl = sender_limits[1]
+    now = _clock()
+    if ttl is not None and now - value_senders[senderkey] > ttl:
+        _evict_senders()
+    else:
+        value_senders[senderkey] = now
+        value_senders.move_to_end(senderkey)
+
+
+def _evict_senders(keep=None):
+    """Evict least recently used value senders beyond the limits set
+    by ``set_sender_limits``, except ``keep``."""
+    global evictions
+    max_senders, ttl = sender_limits
+    now = _clock()
+    count = 0
+    while value_senders:
+        senderkey, used = next(iter(value_senders.items()))
+        if senderkey == keep:
+            break
+        expired = ttl is not None and now - used > ttl
+        if not expired and (max_senders is None or len(value_senders) <= max_senders):
+            break
+        _remove_sender(senderkey)
+        count += 1
+    evictions += count
+    return count
+
+
+def _where_matches(where, named):
+    """Whether the named arguments ``named`` match the ``where`` filter
+    of a connection."""
+    for name, value in where.items():
+        if name not in named or named[name] != value:
+            return False
+    return True
+
+
+def _select_rows(columns, where):
+    """Return ``columns`` restricted to the rows matching ``where``, as
+    lists, or ``None`` if no row matches."""
+    for name in where:
+        if name not in columns:
+            return None
+    selected = [
+        index
+        for index, values in enumerate(zip(*(columns[name] for name in where)))
+        if all(value == expected for value, expected in zip(values, where.values()))
+    ]
+    if not selected:
+        return None
+    return {
+        name: [column[index] for index in selected] for name, column in columns.items()
+    }
+
+
+def _routes_changed():
+    global route_version
+    route_version += 1
+
+
+def _get_signals(sender, senderkey=None):
+    """Get the signal table for ``sender``, creating it if needed.
+
+    ``senderkey`` defaults to the key of ``sender``.  Returns a
+    ``(senderkey, signals)`` pair.
+    """
+    if senderkey is None:
+        senderkey = _sender_key(sender)
+    if senderkey in connections:
+        signals = connections[senderkey]
+    else:
+        connections[senderkey] = signals = {}
+    if type(senderkey) is tuple and senderkey[0] is _VALUE:
+        value_senders[senderkey] = _clock()
+        value_senders.move_to_end(senderkey)
+        if sender_limits is not None:
+            _evict_senders(keep=senderkey)
+        return senderkey, signals
+    # Keep track of senders for cleanup.
+    # Is Anonymous something we want to clean up?
+    if sender not in (None, Anonymous, Any):
+        weak_sender = senders.get(senderkey)
+        if weak_sender is None or weak_sender() is not sender:
+
+            def remove(object, senderkey=senderkey):
+                _remove_sender(senderkey=senderkey)
+
+            # Skip objects that can not be weakly referenced, which means
+            # they won't be automatically cleaned up, but that's too bad.
+            try:
+                weak_sender = weakref.ref(sender, remove)
+                senders[senderkey] = weak_sender
+            except Exception:
+                pass
+    return senderkey, signals
+
+
+def _add_receiver(receiver, signal, senderkey, receivers, where=None):
+    """Add ``receiver`` to the ``receivers`` table of ``senderkey`` and
+    ``signal``, replacing any current connection of the same receiver.
+
+    Returns the new ``Connection``.
+    """
+    receiver_id = id(receiver)
+    # remove any current references to this receiver in the set,
+    # including back-references
+    if receiver in receivers:
+        _remove_old_back_refs(senderkey, signal, receiver, receivers)
+    current = senders_back.get(receiver_id)
+    if current is None:
+        senders_back[receiver_id] = current = {}
+    current[senderkey] = current.get(senderkey, 0) + 1
+    connection = Connection(receiver, signal, senderkey, where)
+    receivers.add(receiver, connection)
+    return connection
+
+
+def _type_key(cls):
+    """Return the sender key for connections to senders of type
+    ``cls``."""
+    return ("type", id(cls))
+
+
+def _get_type_keys(sender):
+    """Return the ``typed_senders`` keys which apply to ``sender``."""
+    cls = type(sender)
+    keys = type_routes.get(cls)
+    if keys is None:
+        keys = [key for key in map(_type_key, cls.__mro__) if key in typed_senders]
+        type_routes[cls] = keys
+    return keys
+
+
+def _connect_spec(receiver, signal=All, sender=Any, weak=True):
+    """Normalize a ``connect_many``/``disconnect_many`` spec tuple."""
+    if signal is None:
+        raise error.DispatcherTypeError(
+            f"Signal cannot be None (receiver={receiver!r} sender={sender!r})"
+        )
+    return receiver, signal, sender, weak
+
+
+def _group_specs(specs):
+    """Group normalized specs by sender and signal::
+
+    { senderkey : (sender, { signal : [(index, receiver, weak)...] }) }
+    """
+    groups = {}
+    for index, spec in enumerate(specs):
+        receiver, signal, sender, weak = spec
+        senderkey = _sender_key(sender)
+        if senderkey in groups:
+            signals = groups[senderkey][1]
+        else:
+            signals = {}
+            groups[senderkey] = (sender, signals)
+        signals.setdefault(signal, []).append((index, receiver, weak))
+    return groups
+
+
 def _remove_receiver(receiver):
     """Remove ``receiver`` from connections."""
     if not senders_back:
         # During module cleanup the mapping will be replaced with None.
         return False
     backKey = id(receiver)
-    for senderkey in senders_back.get(backKey, ()):
+    for senderkey in list(senders_back.get(backKey, ())):
         try:
             signals = list(connections[senderkey].keys())
         except KeyError:
@@ -494,7 +1628,13 @@ def _cleanup_connections(senderkey, signal):
 
 def _remove_sender(senderkey):
     """Remove ``senderkey`` from connections."""
+    _routes_changed()
+    value_senders.pop(senderkey, None)
+    id_routes.pop(senderkey, None)
     _remove_back_refs(senderkey)
+    if senderkey in typed_senders:
+        typed_senders.discard(senderkey)
+        type_routes.clear()
     try:
         del connections[senderkey]
     except KeyError:
@@ -520,50 +1660,69 @@ def _remove_back_refs(senderkey):
 
 
 def _remove_old_back_refs(senderkey, signal, receiver, receivers):
-    """Kill old ``senders_back`` references from ``receiver``.
-
-    This guards against multiple registration of the same receiver for
-    a given signal and sender leaking memory as old back reference
-    records build up.
+    """Remove the connection of ``receiver`` from ``receivers``, the
+    table of ``senderkey`` and ``signal``, and release its back
+    reference.
 
-    Also removes old receiver instance from receivers.
+    The back reference from ``receiver`` to ``senderkey`` is killed
+    when ``receiver`` is not connected to any other signal of
+    ``senderkey``.  Returns whether it was killed.
     """
     try:
-        index = receivers.index(receiver)
-        # need to scan back references here and remove senderkey
-    except ValueError:
+        old_connection = receivers.remove(receiver)
+    except KeyError:
         return False
-    else:
-        old_receiver = receivers[index]
-        del receivers[index]
-        found = 0
-        signals = connections.get(signal)
-        if signals is not None:
-            for sig, recs in list(connections.get(signal, {}).items()):
-                if sig != signal:
-                    for rec in recs:
-                        if rec is old_receiver:
-                            found = 1
-                            break
-        if not found:
-            _kill_back_ref(old_receiver, senderkey)
-            return True
+    return _release_back_ref(old_connection.receiver, senderkey)
+
+
+def _remove_connections(senderkey, receivers, targets):
+    """Remove the connections of the ``targets`` receivers from
+    ``receivers``, a table of ``senderkey``, in one batch, and release
+    their back references.  Returns the number removed."""
+    removed = receivers.remove_many(targets)
+    counts = {}
+    for connection in removed:
+        receiverkey = id(connection.receiver)
+        counts[receiverkey] = counts.get(receiverkey, 0) + 1
+    for receiverkey, count in counts.items():
+        senders = senders_back.get(receiverkey)
+        if senders is None:
+            continue
+        count = senders.get(senderkey, 0) - count
+        if count > 0:
+            senders[senderkey] = count
+        else:
+            senders.pop(senderkey, None)
+            if not senders:
+                del senders_back[receiverkey]
+    return len(removed)
+
+
+def _release_back_ref(receiver, senderkey):
+    """Count one connection less from ``receiver`` to ``senderkey``,
+    killing the back reference at zero.  Returns whether it was
+    killed."""
+    receiverkey = id(receiver)
+    senders = senders_back.get(receiverkey)
+    if senders is None:
         return False
+    count = senders.get(senderkey, 0) - 1
+    if count > 0:
+        senders[senderkey] = count
+        return False
+    senders.pop(senderkey, None)
+    if not senders:
+        del senders_back[receiverkey]
+    return True
 
 
 def _kill_back_ref(receiver, senderkey):
     """Do actual removal of back reference from ``receiver`` to
     ``senderkey``."""
     receiverkey = id(receiver)
-    senders = senders_back.get(receiverkey, ())
-    while senderkey in senders:
-        try:
-            senders.remove(senderkey)
-        except Exception:
-            break
-    if not senders:
-        try:
+    senders = senders_back.get(receiverkey)
+    if senders is not None:
+        senders.pop(senderkey, None)
+        if not senders:
             del senders_back[receiverkey]
-        except KeyError:
-            pass
     return True
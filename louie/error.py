@@ -20,3 +20,17 @@ class DispatcherTypeError(TypeError, DispatcherError):
 class PluginTypeError(TypeError, LouieError):
     """Error raise when trying to install more than one plugin of a
     certain type."""
+
+
+class EventBusClosedError(LouieError):
+    """Error raised when posting to an event bus which was shut down."""
+
+
+class TimerWheelClosedError(LouieError):
+    """Error raised when scheduling on a timer wheel which was shut
+    down."""
+
+
+class ReentrancyError(LouieError):
+    """Error raised for a re-entrant receiver call refused by a
+    ``ReentrancyPlugin``."""
@@ -0,0 +1,149 @@
+"""Bounded mailboxes for receivers.
+
+A receiver connected with ``connect(..., mailbox=size)`` is not called
+by ``send``.  Instead the call is queued in a ``Mailbox`` and made
+later by a worker thread, so a slow receiver does not hold up the
+sender or the receivers after it.
+
+The worker thread is started when a call is queued and stops after
+the mailbox has been empty for ``idle`` seconds, so mailboxes of
+disconnected receivers do not keep threads around.
+
+What happens when a call is queued in a full mailbox depends on the
+overflow policy:
+
+- ``BLOCK``: Wait for room in the mailbox, for at most ``timeout``
+  seconds if given, after which the call is dropped.
+
+- ``DROP_OLDEST``: Drop the oldest queued call to make room.
+
+- ``DROP_NEWEST``: Drop the call being queued.
+"""
+
+import collections
+import threading
+import traceback
+
+from louie import robustapply
+from louie.response import Dropped, Queued
+
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class Mailbox(object):
+    """Bounded queue of receiver calls, drained by a worker thread.
+
+    - ``size``: The maximum number of queued calls.
+
+    - ``overflow``: The overflow policy, one of ``OVERFLOW_POLICIES``.
+
+    - ``timeout``: For the ``BLOCK`` policy, how long to wait for room
+      in the mailbox, or ``None`` to wait indefinitely.
+
+    - ``idle``: Seconds the worker thread waits for new calls before
+      stopping.
+
+    Attributes for monitoring:
+
+    - ``depth``: Number of queued calls.
+
+    - ``delivered``: Number of calls made.
+
+    - ``dropped``: Number of calls dropped because the mailbox was
+      full.
+
+    - ``errors``: Number of calls that raised an exception.  The
+      traceback is printed, as there is no sender to propagate it to.
+    """
+
+    def __init__(self, size, overflow=BLOCK, timeout=None, idle=1.0):
+        if size < 1:
+            raise ValueError(f"Mailbox size must be positive, not {size!r}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown mailbox overflow policy {overflow!r}")
+        self.size = size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.idle = idle
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._worker = None
+        self._busy = False
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} depth={self.depth} size={self.size} "
+            f"dropped={self.dropped}>"
+        )
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def put(self, receiver, signature, arguments, named):
+        """Queue a call of ``receiver``, as for ``robust_apply``.
+
+        Returns ``Queued``, or ``Dropped`` if the call was dropped.
+        """
+        queue = self._queue
+        with self._condition:
+            if len(queue) >= self.size:
+                if self.overflow == DROP_NEWEST:
+                    self.dropped += 1
+                    return Dropped
+                elif self.overflow == DROP_OLDEST:
+                    queue.popleft()
+                    self.dropped += 1
+                elif not self._condition.wait_for(
+                    lambda: len(queue) < self.size, self.timeout
+                ):
+                    self.dropped += 1
+                    return Dropped
+            queue.append((receiver, signature, arguments, named))
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=f"louie-{self!r}", daemon=True
+                )
+                self._worker.start()
+            else:
+                self._condition.notify_all()
+        return Queued
+
+    def join(self, timeout=None):
+        """Wait until all queued calls have been made.
+
+        Returns False if ``timeout`` seconds passed first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._queue and not self._busy, timeout
+            )
+
+    def _run(self):
+        queue = self._queue
+        condition = self._condition
+        while True:
+            with condition:
+                self._busy = False
+                if not queue:
+                    condition.notify_all()
+                    if not condition.wait_for(lambda: queue, self.idle):
+                        self._worker = None
+                        return
+                receiver, signature, arguments, named = queue.popleft()
+                self._busy = True
+                # Wake up senders waiting for room.
+                condition.notify_all()
+            try:
+                robustapply.robust_apply(receiver, signature, *arguments, **named)
+            except Exception:
+                self.errors += 1
+                traceback.print_exc()
+            self.delivered += 1
@@ -1,5 +1,11 @@
 """Common plugins for Louie."""
 
+import functools
+import inspect
+import sys
+import threading
+import weakref
+
 from louie import dispatcher, error
 
 
@@ -35,76 +41,273 @@ class Plugin(object):
         """Return a callable that passes arguments to the receiver.
 
         Useful when you want to change the behavior of all receivers.
+
+        ``receiver`` may already be wrapped by other plugins.  Wrappers
+        should have a ``__wrapped__`` attribute holding the callable
+        they wrap, as set by ``functools.wraps``, so the original
+        receiver can be found with ``inspect.unwrap``.
         """
         return receiver
 
+    def on_send(self, signal, sender, arguments, named):
+        """Called once at the start of every send, before any receiver.
+
+        ``arguments`` and ``named`` are the positional and named
+        arguments of the send, and must not be modified.
+        ``dispatcher.send_function()`` returns the name of the send
+        function making the send.
+        """
+
+    def on_send_end(self, signal, sender):
+        """Called once at the end of every send whose ``on_send`` hook
+        was called, after every receiver, even if a receiver raised.
+        """
+
 
 class QtWidgetPlugin(Plugin):
-    """A Plugin for Louie that knows how to handle Qt widgets
-    when using PyQt built with SIP 4 or higher.
+    """A Plugin for Louie that knows how to handle Qt objects when
+    using PyQt6, PySide6 or PyQt5.
 
-    Weak references are not useful when dealing with QWidget
+    Weak references are not useful when dealing with QObject
     instances, because even after a QWidget is closed and destroyed,
     only the C++ object is destroyed.  The Python 'shell' object
     remains, but raises a RuntimeError when an attempt is made to call
-    an underlying QWidget method.
+    an underlying QObject method.
 
-    This plugin alleviates this behavior, and if a QWidget instance is
+    This plugin alleviates this behavior, and if a QObject instance is
     found that is just an empty shell, it prevents Louie from
     dispatching to any methods on those objects.
+
+    Liveness is checked once per object, with ``sip.isdeleted`` or
+    ``shiboken6.isValid``, and then cached until the object's
+    ``destroyed`` signal is emitted.  Receivers on destroyed objects
+    are disconnected, so they are not checked again.
+
+    - ``qobject``, ``is_deleted``: The QObject class and a function
+      telling whether the C++ object of a QObject has been deleted.
+      By default these are found in the Qt binding in use.
     """
 
-    def __init__(self):
-        try:
-            import qt
-        except ImportError:
-            self.is_live = self._is_live_no_qt
-        else:
-            self.qt = qt
+    def __init__(self, qobject=None, is_deleted=None):
+        if qobject is None:
+            binding = _find_qt()
+            if binding is None:
+                self.is_live = self._is_live_no_qt
+                return
+            qobject, is_deleted = binding
+        self.qobject = qobject
+        self.is_deleted = is_deleted
+        # { QObject : { function or builtin method name... } } for live
+        # objects.
+        self._methods = weakref.WeakKeyDictionary()
 
     def is_live(self, receiver):
-        """If receiver is a method on a QWidget, only return True if
+        """If receiver is a method on a QObject, only return True if
         it hasn't been destroyed."""
-        if hasattr(receiver, "im_self") and isinstance(
-            receiver.__self__, self.qt.QWidget
-        ):
-            try:
-                receiver.__self__.x()
-            except RuntimeError:
+        obj = getattr(receiver, "__self__", None)
+        if obj is None or not isinstance(obj, self.qobject):
+            return True
+        methods = self._methods.get(obj)
+        if methods is None:
+            if self.is_deleted(obj):
+                self._disconnect(obj, (_method_key(receiver),))
                 return False
+            self._methods[obj] = methods = set()
+            obj.destroyed.connect(functools.partial(self._destroyed, weakref.ref(obj)))
+        methods.add(_method_key(receiver))
         return True
 
     def _is_live_no_qt(self, receiver):
         return True
 
+    def _destroyed(self, ref, *args):
+        obj = ref()
+        if obj is not None:
+            self._disconnect(obj, self._methods.pop(obj, ()))
+
+    def _disconnect(self, obj, methods):
+        for method in methods:
+            if isinstance(method, str):
+                # Builtin methods can only be connected with weak=False.
+                dispatcher.disconnect_all(receiver=getattr(obj, method), weak=False)
+            else:
+                receiver = method.__get__(obj)
+                dispatcher.disconnect_all(receiver=receiver)
+                dispatcher.disconnect_all(receiver=receiver, weak=False)
+
+
+def _method_key(receiver):
+    """Identify the method ``receiver`` without referencing its object:
+    by its function, or by name for builtin methods of extension types,
+    such as ``widget.close``, which have no ``__func__``."""
+    function = getattr(receiver, "__func__", None)
+    if function is None:
+        return receiver.__name__
+    return function
+
+
+def _find_qt():
+    """Return ``(QObject, is_deleted)`` for the Qt binding in use, or
+    ``None`` if there is none.
+
+    Bindings which have already been imported are preferred.
+    """
+
+    def pyqt6():
+        from PyQt6 import QtCore, sip
+
+        return QtCore.QObject, sip.isdeleted
+
+    def pyside6():
+        import shiboken6
+        from PySide6 import QtCore
+
+        return QtCore.QObject, lambda obj: not shiboken6.isValid(obj)
+
+    def pyqt5():
+        from PyQt5 import QtCore
+
+        try:
+            from PyQt5 import sip
+        except ImportError:
+            import sip
+        return QtCore.QObject, sip.isdeleted
+
+    bindings = [("PyQt6", pyqt6), ("PySide6", pyside6), ("PyQt5", pyqt5)]
+    bindings.sort(key=lambda binding: binding[0] not in sys.modules)
+    for name, binding in bindings:
+        try:
+            return binding()
+        except ImportError:
+            pass
+    return None
+
 
 class TwistedDispatchPlugin(Plugin):
     """Plugin for Louie that wraps all receivers in callables
     that return Twisted Deferred objects.
 
-    When the wrapped receiver is called, it adds a call to the actual
-    receiver to the reactor event loop, and returns a Deferred that is
-    called back with the result.
+    When the wrapped receiver is called, it queues a call to the actual
+    receiver, and returns a Deferred that is called back with the
+    result.  All calls queued during one reactor iteration, whether by
+    one send or by several, are made in order by a single reactor
+    callback.
+
+    - ``reactor``: The reactor to schedule calls with.  Defaults to
+      the global Twisted reactor.
     """
 
-    def __init__(self):
+    def __init__(self, reactor=None):
         # Don't import reactor ourselves, but make access to it
         # easier.
         from twisted import internet
         from twisted.internet.defer import Deferred
 
         self._internet = internet
+        self._reactor = reactor
         self._Deferred = Deferred
+        self._pending = []
+
+    @property
+    def reactor(self):
+        if self._reactor is None:
+            return self._internet.reactor
+        return self._reactor
 
     def wrap_receiver(self, receiver):
-        def wrapper(*args, **kw):
-            d = self._Deferred()
+        wrapper = functools.partial(self._queue, receiver)
+        wrapper.__wrapped__ = receiver
+        return wrapper
+
+    def _queue(self, receiver, *args, **kw):
+        d = self._Deferred()
+        self._pending.append((d, receiver, args, kw))
+        if len(self._pending) == 1:
+            self.reactor.callLater(0, self._flush)
+        return d
+
+    def _flush(self):
+        # Calls queued by receivers from here on go in the next batch.
+        pending = self._pending
+        self._pending = []
+        for d, receiver, args, kw in pending:
+            try:
+                result = receiver(*args, **kw)
+            except Exception:
+                d.errback()
+            else:
+                d.callback(result)
 
-            def called(dummy):
-                return receiver(*args, **kw)
 
-            d.addCallback(called)
-            self._internet.reactor.callLater(0, d.callback, None)
-            return d
+class AsyncioDispatchPlugin(Plugin):
+    """Plugin for Louie that wraps all receivers in callables that
+    schedule the call on an asyncio event loop.
 
+    The wrapped receivers can be called from any thread.  Each call
+    returns an ``asyncio.Future`` bound to the loop, which gets the
+    result of the actual receiver.  If the receiver returns an
+    awaitable, such as the coroutine of an ``async def`` receiver, it
+    is run as a task and the future gets the task's result.
+
+    All calls queued before the loop gets to them, whether by one send
+    or by several, are made in order by a single loop callback.
+
+    - ``loop``: The event loop to schedule calls on.  Defaults to the
+      running loop.
+    """
+
+    def __init__(self, loop=None):
+        # Imported here, as asyncio is slow to import and most users of
+        # Louie do not need it.
+        import asyncio
+
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        self._asyncio = asyncio
+        self.loop = loop
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def wrap_receiver(self, receiver):
+        wrapper = functools.partial(self._queue, receiver)
+        wrapper.__wrapped__ = receiver
         return wrapper
+
+    def _queue(self, receiver, *args, **kw):
+        future = self._asyncio.Future(loop=self.loop)
+        with self._lock:
+            self._pending.append((future, receiver, args, kw))
+            schedule = len(self._pending) == 1
+        if schedule:
+            self.loop.call_soon_threadsafe(self._flush)
+        return future
+
+    def _flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        for future, receiver, args, kw in pending:
+            if future.cancelled():
+                continue
+            try:
+                result = receiver(*args, **kw)
+            except Exception as err:
+                future.set_exception(err)
+                continue
+            if inspect.isawaitable(result):
+                task = self._asyncio.ensure_future(result, loop=self.loop)
+                task.add_done_callback(functools.partial(_copy_result, future))
+            else:
+                future.set_result(result)
+
+
+def _copy_result(future, task):
+    """Copy the outcome of ``task`` to ``future``."""
+    if future.cancelled():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
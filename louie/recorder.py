@@ -0,0 +1,204 @@
+"""Recording and replaying of sent signals.
+
+A ``RecorderPlugin`` appends a record of every send to a binary log.
+A ``Replayer`` reads a log and sends the recorded signals again through
+the dispatcher, at the original pace or as fast as possible.
+
+A log starts with the 8 byte ``MAGIC`` string, followed by records
+made of a ``(timestamp, size)`` header and ``size`` bytes holding the
+encoded ``(signal, sender id, arguments, named, function)`` tuple,
+where ``function`` is the name of the dispatcher function which made
+the send, one of ``SEND_FUNCTIONS``.  Timestamps are ``time.time()``
+values.
+
+Senders are recorded through ``sender_name`` and replayed through
+``resolve_sender``, with ``Anonymous`` recorded as ``None``, as in
+``louie.bridge``.  By default senders are recorded by their key in the
+routing tables: senders keyed by value, such as strings and numbers,
+are replayed as themselves, and other senders as their id.  Sends
+whose arguments cannot be encoded are counted in
+``RecorderPlugin.skipped`` instead of being recorded.
+"""
+
+import mmap
+import pickle
+import struct
+import threading
+import time
+
+from louie import dispatcher
+from louie.plugin import Plugin
+from louie.sender import Anonymous
+
+MAGIC = b"LOUIELOG"
+
+SEND_FUNCTIONS = ("send", "send_minimal", "send_exact", "send_robust", "send_batch")
+
+_HEADER = struct.Struct("<dI")
+
+
+def sender_id(sender):
+    """Default ``sender_name``: the key of ``sender`` in the routing
+    tables."""
+    return dispatcher._sender_key(sender)
+
+
+def resolve_sender_id(senderkey):
+    """Default ``resolve_sender``: the sender of a key made by
+    ``sender_id`` if it is keyed by value, else the key itself."""
+    if type(senderkey) is tuple and senderkey[0] == dispatcher._VALUE:
+        return senderkey[-1]
+    return senderkey
+
+
+class RecorderPlugin(Plugin):
+    """Plugin for Louie that records every send to a log.
+
+    - ``file``: Path of the log, or a binary file object opened for
+      writing.  A path is opened for appending, and the log is only
+      started if the file is empty.
+
+    - ``sender_name``: Callable mapping a sender to the value recorded
+      in its place.  Defaults to ``sender_id``.
+
+    - ``codec``: Object with ``dumps`` and ``loads`` functions which
+      convert records to and from bytes.  Defaults to ``pickle``.
+
+    - ``buffer_size``: Size of the write buffer when ``file`` is a
+      path.
+
+    - ``clock``: Callable returning the timestamp of a record.
+
+    Records are buffered; call ``flush`` or ``close`` to write them.
+    """
+
+    def __init__(
+        self,
+        file,
+        sender_name=sender_id,
+        codec=pickle,
+        buffer_size=1 << 20,
+        clock=time.time,
+    ):
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            file = open(file, "ab", buffering=buffer_size)
+        self.file = file
+        self.sender_name = sender_name
+        self.codec = codec
+        self.clock = clock
+        self.recorded = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        if file.tell() == 0:
+            file.write(MAGIC)
+
+    def on_send(self, signal, sender, arguments, named):
+        if sender is Anonymous:
+            sender = None
+        else:
+            sender = self.sender_name(sender)
+        try:
+            data = self.codec.dumps(
+                (
+                    signal,
+                    sender,
+                    arguments,
+                    named,
+                    # None when the hook is not called by the dispatcher.
+                    dispatcher.send_function() or "send",
+                )
+            )
+        except Exception:
+            self.skipped += 1
+            return
+        header = _HEADER.pack(self.clock(), len(data))
+        with self._lock:
+            self.file.write(header)
+            self.file.write(data)
+            self.recorded += 1
+
+    def flush(self):
+        """Write buffered records to the log."""
+        with self._lock:
+            self.file.flush()
+
+    def close(self):
+        """Write buffered records and close the log."""
+        with self._lock:
+            self.file.close()
+
+
+class Replayer(object):
+    """Send the signals recorded in a log again.
+
+    - ``path``: Path of the log.  It is memory mapped, not read.
+
+    - ``resolve_sender``: Callable mapping the value recorded in place
+      of a sender back to a sender.  Defaults to
+      ``resolve_sender_id``.
+
+    - ``codec``: The codec used by the ``RecorderPlugin``.
+
+    Remove any ``RecorderPlugin`` before replaying, or the replayed
+    sends are recorded again.
+    """
+
+    def __init__(self, path, resolve_sender=resolve_sender_id, codec=pickle):
+        self.resolve_sender = resolve_sender
+        self.codec = codec
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path!r} is not a Louie signal log")
+
+    def __iter__(self):
+        """Produce ``(timestamp, signal, sender, arguments, named,
+        function)`` for each record in the log."""
+        data = self._map
+        offset = len(MAGIC)
+        end = len(data) - _HEADER.size
+        while offset <= end:
+            timestamp, size = _HEADER.unpack_from(data, offset)
+            offset += _HEADER.size
+            if offset + size > len(data):
+                # Incomplete record at the end of a log being written.
+                break
+            record = self.codec.loads(data[offset : offset + size])
+            offset += size
+            signal, sender, arguments, named, function = record
+            if sender is None:
+                sender = Anonymous
+            else:
+                sender = self.resolve_sender(sender)
+            yield timestamp, signal, sender, arguments, named, function
+
+    def replay(self, speed=None, send=None):
+        """Send all recorded signals, returning how many were sent.
+
+        - ``speed``: ``None`` to send as fast as possible, or a factor
+          applied to the original pace, so ``1.0`` keeps the recorded
+          intervals between sends.
+
+        - ``send``: The send function to use for all records.  By
+          default each record is sent with the dispatcher function
+          which made it, such as ``send_robust`` or ``send_batch``.
+        """
+        count = 0
+        start = first = None
+        for timestamp, signal, sender, arguments, named, function in self:
+            if speed is not None:
+                if first is None:
+                    start, first = time.monotonic(), timestamp
+                delay = (timestamp - first) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            if send is None:
+                getattr(dispatcher, function)(signal, sender, *arguments, **named)
+            else:
+                send(signal, sender, *arguments, **named)
+            count += 1
+        return count
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,200 @@
+"""Guarding receivers against re-entrant calls.
+
+A call is re-entrant when a receiver is called while it, or another
+receiver of the same signal, is already running further up the stack
+of the same thread, typically because a receiver sends the signal it
+is receiving.  A ``ReentrancyPlugin`` applies a policy to such calls:
+
+- ``ALLOW``: Make the call, as Louie does by default.
+
+- ``SKIP``: Do not make the call.  Its response is ``Skipped``.
+
+- ``DEFER``: Make the call after the outermost send of the thread has
+  called all its receivers.  Its response is ``Deferred``.
+
+- ``RAISE``: Raise ``ReentrancyError``.
+
+Policies can be set for particular receivers and signals, which take
+precedence over the default policy in that order.  A maximum nesting
+depth of receiver calls can also be set, beyond which calls raise
+``ReentrancyError`` whatever the policy.
+
+State is kept per thread, so calls in different threads never count
+as re-entrant.
+"""
+
+import inspect
+import threading
+
+from louie import error
+from louie.plugin import Plugin
+from louie.response import Deferred, Skipped
+
+ALLOW = "allow"
+SKIP = "skip"
+DEFER = "defer"
+RAISE = "raise"
+
+POLICIES = (ALLOW, SKIP, DEFER, RAISE)
+
+
+def _key(receiver):
+    """Identify a receiver, as bound methods are created anew on each
+    attribute access."""
+    if getattr(receiver, "__self__", None) is not None and hasattr(
+        receiver, "__func__"
+    ):
+        return id(receiver.__self__), id(receiver.__func__)
+    return id(receiver)
+
+
+class ReentrancyPlugin(Plugin):
+    """Plugin for Louie applying policies to re-entrant receiver calls.
+
+    - ``policy``: The default policy, one of ``POLICIES``.
+
+    - ``signals``: Dictionary of ``{ signal : policy }``.
+
+    - ``max_depth``: Maximum number of nested receiver calls in a
+      thread, or ``None``.
+
+    Use ``set_policy`` for policies of particular receivers.
+
+    Attributes for monitoring, counting re-entrant calls:
+
+    - ``allowed``, ``skipped``, ``deferred``, ``raised``: By policy.
+
+    - ``too_deep``: Calls refused for exceeding ``max_depth``.
+    """
+
+    def __init__(self, policy=ALLOW, signals=None, max_depth=None):
+        self.policy = self._check(policy)
+        self.signals = {}
+        for signal, signal_policy in (signals or {}).items():
+            self.signals[signal] = self._check(signal_policy)
+        self.max_depth = max_depth
+        # { receiver key : policy }
+        self.receivers = {}
+        self.allowed = 0
+        self.skipped = 0
+        self.deferred = 0
+        self.raised = 0
+        self.too_deep = 0
+        self._local = threading.local()
+
+    def set_policy(self, receiver, policy):
+        """Set the policy of ``receiver``, or remove it if ``policy`` is
+        ``None``.
+
+        Receivers are identified by id, so the policy should be removed
+        when the receiver is disconnected for good.
+        """
+        if policy is None:
+            self.receivers.pop(_key(receiver), None)
+        else:
+            self.receivers[_key(receiver)] = self._check(policy)
+
+    def _check(self, policy):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown re-entrancy policy {policy!r}")
+        return policy
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, "depth"):
+            state.depth = 0
+            # Number of sends in progress.
+            state.sends = 0
+            state.signal = None
+            # { receiver key or ("signal", signal) : number of running calls }
+            state.running = {}
+            state.pending = []
+            state.draining = False
+        return state
+
+    def on_send(self, signal, sender, arguments, named):
+        state = self._state()
+        state.sends += 1
+        state.signal = signal
+
+    def on_send_end(self, signal, sender):
+        state = self._state()
+        state.sends -= 1
+        self._drain(state)
+
+    def wrap_receiver(self, receiver):
+        signal = self._state().signal
+        # Key on the receiver itself, not the wrappers of other plugins.
+        key = _key(inspect.unwrap(receiver))
+        # Tag signals so they can not clash with receiver keys.
+        signal_key = ("signal", signal)
+
+        def guarded(*arguments, **named):
+            state = self._state()
+            running = state.running
+            if self.max_depth is not None and state.depth >= self.max_depth:
+                self.too_deep += 1
+                raise error.ReentrancyError(
+                    f"Receiver {receiver!r} for signal {signal!r} nested "
+                    f"deeper than {self.max_depth}"
+                )
+            if running.get(key) or running.get(signal_key):
+                policy = self.receivers.get(key) or self.signals.get(
+                    signal, self.policy
+                )
+                if policy == SKIP:
+                    self.skipped += 1
+                    return Skipped
+                elif policy == DEFER:
+                    self.deferred += 1
+                    state.pending.append(
+                        (receiver, signal, key, signal_key, arguments, named)
+                    )
+                    return Deferred
+                elif policy == RAISE:
+                    self.raised += 1
+                    raise error.ReentrancyError(
+                        f"Re-entrant call of {receiver!r} for signal {signal!r}"
+                    )
+                self.allowed += 1
+            return self._call(
+                state, receiver, signal, key, signal_key, arguments, named
+            )
+
+        guarded.__wrapped__ = receiver
+        return guarded
+
+    def _call(self, state, receiver, signal, key, signal_key, arguments, named):
+        running = state.running
+        state.depth += 1
+        running[key] = running.get(key, 0) + 1
+        running[signal_key] = running.get(signal_key, 0) + 1
+        try:
+            return receiver(*arguments, **named)
+        finally:
+            for running_key in (key, signal_key):
+                count = running[running_key] - 1
+                if count:
+                    running[running_key] = count
+                else:
+                    del running[running_key]
+            state.depth -= 1
+            # Restore the signal after sends made by the receiver.
+            state.signal = signal
+            # Receivers called outside of a send, as by mailbox workers,
+            # end with their outermost call.
+            self._drain(state)
+
+    def _drain(self, state):
+        """Make the deferred calls once no send or receiver call is in
+        progress in the thread."""
+        if state.sends or state.depth or not state.pending or state.draining:
+            return
+        # Deferred calls are made in order, and may defer more.
+        state.draining = True
+        try:
+            pending = state.pending
+            while pending:
+                self._call(state, *pending.pop(0))
+        finally:
+            state.draining = False
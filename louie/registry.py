@@ -0,0 +1,171 @@
+"""Lazy registration of receivers.
+
+Receivers can be registered without being connected, either with the
+``receiver`` decorator or declaratively with ``register``, naming the
+receiver by its import path.  Registered receivers are connected, and
+imported if named by path, just before the first send of their signal
+from a matching sender.  Modules defining many receivers thus cost
+little at import time, and modules whose receivers are never needed
+are never imported.
+
+The module level ``registry`` is installed as a plugin only while it
+holds receivers waiting to be connected, so sends cost nothing extra
+once they are all connected.  ``dispatcher.reset`` forgets the waiting
+receivers along with the connected ones.
+
+Import paths have the form ``"package.module:name"``, where ``name``
+may be dotted to reach attributes of module level objects, or
+``"package.module.name"`` for a module level function.
+"""
+
+import importlib
+import threading
+
+from louie import dispatcher, error
+from louie.plugin import Plugin, install_plugin
+from louie.sender import Any
+from louie.signal import All
+
+
+def resolve(path):
+    """Return the object named by the import ``path``."""
+    if ":" in path:
+        module, _, name = path.partition(":")
+    else:
+        module, _, name = path.rpartition(".")
+    obj = importlib.import_module(module)
+    for attribute in name.split("."):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+class Registry(Plugin):
+    """Plugin for Louie holding receivers until they are needed.
+
+    Entries are ``(receiver, signal, sender, weak)`` tuples, as for
+    ``connect_many``, where ``receiver`` may be an import path.  An
+    entry is connected on the first send of its signal, or of any
+    signal if its signal is ``All``, from its sender, or from any
+    sender if its sender is ``Any``.  Import errors are raised from
+    that send, and the entry is kept.
+
+    A registry installs itself as a plugin when an entry is added, and
+    removes itself once no entries are left.
+    """
+
+    def __init__(self):
+        # { signal : [(receiver, signal, sender, weak)...] }
+        self._pending = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._pending.values())
+
+    def add(self, receiver, signal=All, sender=Any, weak=True):
+        """Register ``receiver``, a callable or an import path."""
+        if signal is None:
+            raise error.DispatcherTypeError(
+                f"Signal cannot be None (receiver={receiver!r} sender={sender!r})"
+            )
+        with self._lock:
+            self._pending.setdefault(signal, []).append(
+                (receiver, signal, sender, weak)
+            )
+            if self not in dispatcher.plugins:
+                install_plugin(self)
+
+    def update(self, specs):
+        """Register many ``(receiver, signal, sender, weak)`` tuples.
+        Trailing items may be omitted to use the defaults of ``add``."""
+        for spec in specs:
+            self.add(*spec)
+
+    def clear(self):
+        """Forget all registered receivers which are not connected yet."""
+        with self._lock:
+            self._pending.clear()
+            self._uninstall()
+
+    def connect_pending(self, signal=All, sender=Any):
+        """Connect the registered receivers for ``signal`` and
+        ``sender`` now, or all of them by default.
+
+        Returns the ``Connection`` handles.
+        """
+        with self._lock:
+            if signal is All:
+                signals = list(self._pending)
+            else:
+                signals = [signal, All]
+            # Senders match as they do in the routing tables, so equal
+            # senders keyed by value match.
+            senderkey = dispatcher._sender_key(sender)
+            ready = []
+            for key in signals:
+                entries = self._pending.get(key)
+                if not entries:
+                    continue
+                for entry in entries:
+                    if (
+                        sender is Any
+                        or entry[2] is Any
+                        or dispatcher._sender_key(entry[2]) == senderkey
+                    ):
+                        ready.append(entry)
+            if not ready:
+                return []
+            specs = [
+                (
+                    resolve(receiver) if isinstance(receiver, str) else receiver,
+                    entry_signal,
+                    entry_sender,
+                    weak,
+                )
+                for receiver, entry_signal, entry_sender, weak in ready
+            ]
+            connections = dispatcher.connect_many(specs)
+            done = set(map(id, ready))
+            for key in signals:
+                entries = self._pending.get(key)
+                if entries:
+                    entries[:] = [entry for entry in entries if id(entry) not in done]
+                    if not entries:
+                        del self._pending[key]
+            if not self._pending:
+                self._uninstall()
+            return connections
+
+    def _uninstall(self):
+        if self in dispatcher.plugins:
+            # Rebound rather than changed in place, as send may be
+            # iterating over the plugins.
+            dispatcher.plugins = [
+                plugin for plugin in dispatcher.plugins if plugin is not self
+            ]
+
+    def on_send(self, signal, sender, arguments, named):
+        pending = self._pending
+        if pending and (signal in pending or All in pending):
+            self.connect_pending(signal, sender)
+
+
+registry = Registry()
+
+
+def receiver(signal=All, sender=Any, weak=True):
+    """Decorator registering a function as a receiver of ``signal``
+    from ``sender``, connected on first use.  Returns the function
+    unchanged."""
+
+    def decorator(function):
+        registry.add(function, signal, sender, weak)
+        return function
+
+    return decorator
+
+
+def register(specs):
+    """Register many receivers, as ``(receiver, signal, sender, weak)``
+    tuples where ``receiver`` may be an import path, connected on first
+    use."""
+    registry.update(specs)
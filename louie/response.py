@@ -0,0 +1,33 @@
+"""Response classes.
+
+These are returned by the dispatcher in place of a receiver's own
+response when the receiver was not called directly.
+"""
+
+
+class _RESPONSE(type):
+    """Base metaclass for response classes."""
+
+    def __str__(cls):
+        return f"<Response: {cls.__name__}>"
+
+
+class CircuitOpen(object, metaclass=_RESPONSE):
+    """The receiver was not called because its circuit is open."""
+
+
+class Queued(object, metaclass=_RESPONSE):
+    """The call was queued in the receiver's mailbox."""
+
+
+class Dropped(object, metaclass=_RESPONSE):
+    """The call was dropped because the receiver's mailbox was full."""
+
+
+class Skipped(object, metaclass=_RESPONSE):
+    """The call was skipped because it was re-entrant."""
+
+
+class Deferred(object, metaclass=_RESPONSE):
+    """The re-entrant call was deferred until the outermost receiver
+    call returns."""
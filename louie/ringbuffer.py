@@ -0,0 +1,334 @@
+"""Shared memory transport for high rate signals between processes on
+the same host.
+
+A ``RingBuffer`` is a single-producer, single-consumer queue of fixed
+size records in a ``multiprocessing.shared_memory`` block.  The
+producer only writes the head index and the consumer only writes the
+tail index, so no lock is needed.  This relies on aligned 8 byte index
+updates becoming visible to the other process in order, which holds on
+the platforms CPython supports.
+
+A ``RingSender`` is connected as a receiver for chosen signals and
+writes a record for each signal it receives.  A ``RingReceiver`` in
+another process reads the records and re-sends the signals through its
+local dispatcher.
+
+Each record holds a small encoded header, ``(signal, sender name,
+named arguments)``, and optionally one raw buffer argument, named by
+``payload``.  The buffer is copied into shared memory by the sender
+and handed to receivers as a ``memoryview`` of the shared memory, so
+it is not copied again.  The view is only valid while the receivers
+are being called; receivers must copy data they want to keep.
+
+Like ``louie.bridge``, senders are passed through ``sender_name`` and
+``resolve_sender``, with ``Anonymous`` passed as ``None``, and signals
+re-sent by a ``RingReceiver`` are not forwarded again by a
+``RingSender`` in the same process.
+
+This module is not imported by the ``louie`` package, as it needs
+``multiprocessing.shared_memory`` (Python 3.8 or higher).
+"""
+
+import pickle
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from louie import dispatcher
+from louie.bridge import _local
+from louie.sender import Anonymous, Any
+
+# The first _DATA bytes hold 8 byte indexes, read and written through
+# a memoryview so each is a single aligned load or store; pack_into
+# zero-fills before writing, so the other process could read 0.  Head
+# and tail indexes live on separate cache lines.
+_HEAD = 0
+_TAIL = 8
+_SLOTS = 14
+_RECORD_SIZE = 15
+_DATA = 128
+_RECORD = struct.Struct("<II")
+
+
+def _identity(value):
+    return value
+
+
+class RingBuffer(object):
+    """Ring of ``slots`` records of ``record_size`` bytes in shared
+    memory.
+
+    Create a ring with ``RingBuffer(slots=..., record_size=...)`` and
+    attach to it from another process with ``RingBuffer(name=...)``,
+    using the ``name`` of the created ring.
+    """
+
+    def __init__(self, name=None, slots=1024, record_size=512):
+        if name is None:
+            size = _DATA + slots * record_size
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:_DATA] = bytes(_DATA)
+            self.owner = True
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self._index = self.buf[:_DATA].cast("Q")
+        if self.owner:
+            self._index[_SLOTS] = slots
+            self._index[_RECORD_SIZE] = record_size
+        self.slots = self._index[_SLOTS]
+        self.record_size = self._index[_RECORD_SIZE]
+
+    def __len__(self):
+        return self._head() - self._tail()
+
+    def _head(self):
+        return self._index[_HEAD]
+
+    def _tail(self):
+        return self._index[_TAIL]
+
+    def try_put(self, header, payload=b""):
+        """Write a record, returning False if the ring is full.
+
+        Raises ``ValueError`` if the record does not fit in a slot.
+        """
+        header_size = len(header)
+        payload_size = len(payload)
+        if _RECORD.size + header_size + payload_size > self.record_size:
+            raise ValueError(
+                f"Record of {header_size} + {payload_size} bytes does not fit "
+                f"in {self.record_size} byte slots"
+            )
+        head = self._head()
+        if head - self._tail() >= self.slots:
+            return False
+        offset = _DATA + (head % self.slots) * self.record_size
+        buf = self.buf
+        _RECORD.pack_into(buf, offset, header_size, payload_size)
+        offset += _RECORD.size
+        buf[offset : offset + header_size] = header
+        offset += header_size
+        buf[offset : offset + payload_size] = payload
+        # Publish the record.
+        self._index[_HEAD] = head + 1
+        return True
+
+    def put(self, header, payload=b"", timeout=None, interval=0.0001):
+        """Write a record, waiting for room for at most ``timeout``
+        seconds, or indefinitely.  Returns False on timeout."""
+        if self.try_put(header, payload):
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_put(header, payload):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def peek(self):
+        """Return ``(header, payload)`` memoryviews of the oldest
+        record, or ``None`` if the ring is empty.
+
+        The views stay valid until ``release`` is called.
+        """
+        tail = self._tail()
+        if tail == self._head():
+            return None
+        offset = _DATA + (tail % self.slots) * self.record_size
+        header_size, payload_size = _RECORD.unpack_from(self.buf, offset)
+        offset += _RECORD.size
+        header = self.buf[offset : offset + header_size]
+        offset += header_size
+        return header, self.buf[offset : offset + payload_size]
+
+    def release(self):
+        """Free the slot of the oldest record."""
+        self._index[_TAIL] = self._tail() + 1
+
+    def close(self):
+        """Detach from the shared memory, destroying it if this ring
+        created it."""
+        self._index.release()
+        del self._index, self.buf
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach(name):
+    """Attach to existing shared memory without registering it with the
+    resource tracker, which would destroy it when this process exits."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no ``track`` argument.
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class RingSender(object):
+    """Forward signals to another process through a ``RingBuffer``.
+
+    - ``ring``: The ring to write records to.
+
+    - ``signals``: The signals to forward.
+
+    - ``sender``: Only forward signals from this sender.  Defaults to
+      ``Any``.
+
+    - ``sender_name``: Callable mapping a sender to the value sent in
+      its place.
+
+    - ``codec``: Object with ``dumps`` and ``loads`` functions for the
+      record headers.  Defaults to ``pickle``.
+
+    - ``payload``: Name of the named argument passed as a raw buffer,
+      if any.
+
+    - ``timeout``: How long to wait for room in a full ring before
+      dropping the signal, or ``None`` to wait indefinitely.
+
+    Any thread sending the signals writes to the ring, so writes are
+    serialized with a lock to keep the ring single-producer.
+
+    The sender is connected with strong references, so it stays
+    connected until ``close`` is called.
+    """
+
+    def __init__(
+        self,
+        ring,
+        signals,
+        sender=Any,
+        sender_name=_identity,
+        codec=pickle,
+        payload=None,
+        timeout=None,
+    ):
+        self.ring = ring
+        self.sender = sender
+        self.sender_name = sender_name
+        self.codec = codec
+        self.payload = payload
+        self.timeout = timeout
+        self.forwarded = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self.signals = list(signals)
+        dispatcher.connect_many(
+            (self._receive, signal, sender, False) for signal in self.signals
+        )
+
+    def close(self):
+        """Disconnect from the signals."""
+        dispatcher.disconnect_many(
+            (self._receive, signal, self.sender, False) for signal in self.signals
+        )
+
+    def _receive(self, *arguments, **named):
+        if getattr(_local, "bridged", False):
+            # Do not echo signals received from another process.
+            return
+        signal = named.pop("signal")
+        sender = named.pop("sender")
+        if sender is Anonymous:
+            sender = None
+        else:
+            sender = self.sender_name(sender)
+        payload = b""
+        if self.payload is not None:
+            payload = named.pop(self.payload, b"")
+        header = self.codec.dumps((signal, sender, arguments, named))
+        with self._lock:
+            if self.ring.put(header, payload, self.timeout):
+                self.forwarded += 1
+            else:
+                self.dropped += 1
+
+
+class RingReceiver(object):
+    """Re-send signals forwarded by a ``RingSender``.
+
+    - ``ring``: The ring to read records from.
+
+    - ``resolve_sender``: Callable mapping the value sent in place of a
+      sender back to a sender.
+
+    - ``codec``: The codec used by the ``RingSender``.
+
+    - ``payload``: The ``payload`` name used by the ``RingSender``.
+
+    Records can be read with ``receive``, or by a background thread
+    started with ``start``, which polls the ring every ``interval``
+    seconds while it is empty.
+    """
+
+    def __init__(
+        self,
+        ring,
+        resolve_sender=_identity,
+        codec=pickle,
+        payload=None,
+        interval=0.0001,
+    ):
+        self.ring = ring
+        self.resolve_sender = resolve_sender
+        self.codec = codec
+        self.payload = payload
+        self.interval = interval
+        self.received = 0
+        self._stopped = False
+        self._thread = None
+
+    def receive(self, limit=None):
+        """Send the signals of the records in the ring, at most
+        ``limit`` of them.  Returns the number of records read."""
+        ring = self.ring
+        count = 0
+        while limit is None or count < limit:
+            record = ring.peek()
+            if record is None:
+                break
+            header, payload = record
+            _local.bridged = True
+            try:
+                signal, sender, arguments, named = self.codec.loads(header)
+                if self.payload is not None:
+                    named[self.payload] = payload
+                if sender is None:
+                    sender = Anonymous
+                else:
+                    sender = self.resolve_sender(sender)
+                dispatcher.send(signal, sender, *arguments, **named)
+            finally:
+                _local.bridged = False
+                del header, payload, record
+                ring.release()
+            count += 1
+        self.received += count
+        return count
+
+    def start(self):
+        """Read records in a background thread until ``stop`` is
+        called."""
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="louie-ring-receiver", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Read the remaining records and stop the background thread."""
+        self._stopped = True
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped:
+            if not self.receive():
+                time.sleep(self.interval)
+        self.receive()
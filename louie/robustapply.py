@@ -55,3 +55,18 @@ def robust_apply(receiver, signature, *arguments, **named):
             if arg not in acceptable:
                 del named[arg]
     return receiver(*arguments, **named)
+
+
+def accepted_names(signature, count=0):
+    """Return the names of the named arguments ``robust_apply`` passes
+    on to ``signature`` after ``count`` positional arguments, or
+    ``None`` if it accepts all of them through a ``**kwds`` parameter.
+
+    Lets callers analyze a receiver once and call it many times.
+    """
+    signature, code_object, startIndex = function(signature)
+    if code_object.co_flags & 8:
+        return None
+    return frozenset(
+        code_object.co_varnames[startIndex + count : code_object.co_argcount]
+    )
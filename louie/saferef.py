@@ -88,14 +88,17 @@ class BoundMethodWeakref(object):
         short-circuit creation of references to already- referenced
         instance methods.  The key corresponding to the target is
         calculated, and if there is already an existing reference,
-        that is returned, with its deletion_methods attribute updated.
-        Otherwise the new instance is created and registered in the
-        table of already-referenced methods.
+        that is returned, with ``on_delete`` added to its
+        deletion_methods attribute unless already there, so repeated
+        references to a method do not grow the list.  Otherwise the new
+        instance is created and registered in the table of
+        already-referenced methods.
         """
         key = cls.calculate_key(target)
         current = cls._all_instances.get(key)
         if current is not None:
-            current.deletion_methods.append(on_delete)
+            if on_delete is not None and on_delete not in current.deletion_methods:
+                current.deletion_methods.append(on_delete)
             return current
         else:
             base = super(BoundMethodWeakref, cls).__new__(cls)
@@ -119,6 +122,11 @@ class BoundMethodWeakref(object):
           single argument, which will be passed a pointer to this
           object.
         """
+        if "key" in self.__dict__:
+            # An existing reference returned by __new__, which already
+            # added on_delete.  Initializing it again would drop the
+            # deletion methods of earlier references.
+            return
 
         def remove(weak, self_=self):
             """Set self.isDead to True when method or instance is destroyed."""
@@ -141,7 +149,7 @@ class BoundMethodWeakref(object):
                             f"cleanup function {function}: {e}"
                         )
 
-        self.deletion_methods = [on_delete]
+        self.deletion_methods = [] if on_delete is None else [on_delete]
         self.key = self.calculate_key(target)
         try:
             self.weak_self = weakref.ref(target.__self__, remove)
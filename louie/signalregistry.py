@@ -0,0 +1,135 @@
+"""Dense integer ids for signals.
+
+A ``SignalRegistry`` gives each registered signal a small integer id,
+assigned in order of registration.  Sending by id looks up the
+resolved receivers of the signal in a per-sender list indexed by
+signal id, so a send costs list indexing instead of hashing the signal
+in the four or more dictionaries of the routing tables, and the
+signatures of the receivers are only analyzed when the route is
+resolved.
+
+The lists of senders with connections of their own are kept in
+``dispatcher.id_routes``, next to the routing tables, and are dropped
+with the sender's connections, whether it is garbage collected,
+disconnected or evicted by ``set_sender_limits``.  Senders without
+connections of their own only get receivers connected to ``Any`` or to
+their type, so they share one list per type.  The lists are a cache:
+they add a slot per registered signal to each sender sent from by id.
+Any change to the routing tables increments
+``dispatcher.route_version``, after which each list entry is resolved
+again on its next send.
+
+A ``BoundSignal`` does the same for one signal and sender.  A registry
+serves every sender, holds none of them alive, and gives signals ids
+which can stand for them in compact encodings, such as records of
+``louie.bridge`` or ``louie.ringbuffer``.  It pays off for a fixed set
+of signals sent often between rare connects and disconnects.
+
+Registering is opt-in: receivers are still connected to the signals
+themselves, so receivers connected to ``All`` get signals sent by id,
+and signals sent by id or with ``send`` reach the same receivers.
+"""
+
+from louie import dispatcher, error
+from louie.sender import Anonymous, Any
+from louie.signal import All
+
+
+class SignalRegistry(object):
+    """Registry of signals by dense integer id.
+
+    - ``signals``: The registered signals, indexed by id.
+    """
+
+    def __init__(self, signals=()):
+        self.signals = []
+        # { signal : id }
+        self._ids = {}
+        # Lists of senders without connections of their own.
+        # { type of sender, or Anonymous or Any : [(route version, route) or None...] }
+        self._shared = {}
+        for signal in signals:
+            self.register(signal)
+
+    def __len__(self):
+        return len(self.signals)
+
+    def __contains__(self, signal):
+        return signal in self._ids
+
+    def register(self, signal):
+        """Return the id of ``signal``, registering it if needed."""
+        if signal is None or signal is All:
+            raise error.DispatcherTypeError(
+                f"Signal {signal!r} can not be registered with an id"
+            )
+        signal_id = self._ids.get(signal)
+        if signal_id is None:
+            signal_id = self._ids[signal] = len(self.signals)
+            self.signals.append(signal)
+        return signal_id
+
+    def id(self, signal):
+        """Return the id of the registered ``signal``.
+
+        Raises ``DispatcherKeyError`` if it is not registered.
+        """
+        try:
+            return self._ids[signal]
+        except KeyError:
+            raise error.DispatcherKeyError(f"Signal {signal!r} is not registered")
+
+    def clear(self):
+        """Forget the per-sender lists."""
+        self._shared.clear()
+        for tables in dispatcher.id_routes.values():
+            tables.pop(self, None)
+
+    def send(self, signal_id, sender=Anonymous, *arguments, **named):
+        """Send the signal with id ``signal_id``, like
+        ``dispatcher.send``.
+
+        As with ``BoundSignal``, sends fall back to ``dispatcher.send``
+        when plugins are installed, when positional arguments are given
+        or when a receiver of the signal has a ``where`` filter.
+        """
+        signal = self.signals[signal_id]
+        if arguments or dispatcher.plugins:
+            return dispatcher.send(signal, sender, *arguments, **named)
+        senderkey = dispatcher._sender_key(sender)
+        if dispatcher.sender_limits is not None:
+            # May evict the sender, changing the route.
+            dispatcher._use_sender(senderkey)
+        tables = dispatcher.id_routes.get(senderkey)
+        table = None if tables is None else tables.get(self)
+        if table is None:
+            table = self._table(sender, senderkey)
+        if len(table) < len(self.signals):
+            table.extend([None] * (len(self.signals) - len(table)))
+        entry = table[signal_id]
+        version = dispatcher.route_version
+        if entry is None or entry[0] != version:
+            entry = table[signal_id] = (
+                version,
+                dispatcher._resolve_route(sender, signal),
+            )
+        route = entry[1]
+        if route is None:
+            return dispatcher.send(signal, sender, **named)
+        return dispatcher._send_route(route, signal, sender, named)
+
+    def _table(self, sender, senderkey):
+        """Return the list of ``sender``, creating it if needed."""
+        if senderkey in dispatcher.connections:
+            tables = dispatcher.id_routes.setdefault(senderkey, {})
+            return tables.setdefault(self, [])
+        # Without connections of its own, the route of a sender only
+        # depends on its type, except for Anonymous and Any.
+        if sender is Anonymous or sender is Any:
+            shared = sender
+        else:
+            shared = type(sender)
+        table = self._shared.get(shared)
+        if table is None:
+            table = self._shared[shared] = []
+        return table
@@ -0,0 +1,98 @@
+import unittest
+
+import louie
+from louie import breaker
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky(object):
+    def __init__(self):
+        self.fail = True
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ValueError("down")
+        return "up"
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.clock = Clock()
+        self.breaker = louie.CircuitBreaker(threshold=3, cooldown=10, clock=self.clock)
+        louie.install_circuit_breaker(self.breaker)
+
+    def test_trips_after_threshold(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig")
+        for _ in range(3):
+            [(receiver, response)] = louie.send_robust("sig")
+            assert isinstance(response, ValueError)
+        assert self.breaker.state(flaky) == breaker.OPEN
+        [(receiver, response)] = louie.send_robust("sig")
+        assert response is louie.CircuitOpen
+        assert flaky.calls == 3
+        assert list(self.breaker.states().values()) == [breaker.OPEN]
+
+    def test_half_open(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig")
+        for _ in range(3):
+            louie.send_robust("sig")
+        self.clock.now = 10
+        assert self.breaker.state(flaky) == breaker.HALF_OPEN
+        # The trial call fails, so the circuit reopens.
+        [(receiver, response)] = louie.send_robust("sig")
+        assert isinstance(response, ValueError)
+        assert self.breaker.state(flaky) == breaker.OPEN
+        self.clock.now = 20
+        flaky.fail = False
+        [(receiver, response)] = louie.send_robust("sig")
+        assert response == "up"
+        assert self.breaker.state(flaky) == breaker.CLOSED
+        assert self.breaker.states() == {}
+
+    def test_success_resets_count(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig")
+        louie.send_robust("sig")
+        louie.send_robust("sig")
+        flaky.fail = False
+        louie.send_robust("sig")
+        flaky.fail = True
+        louie.send_robust("sig")
+        louie.send_robust("sig")
+        assert self.breaker.state(flaky) == breaker.CLOSED
+
+    def test_reset(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig")
+        for _ in range(3):
+            louie.send_robust("sig")
+        self.breaker.reset(flaky)
+        assert self.breaker.state(flaky) == breaker.CLOSED
+
+    def test_strong_receiver(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig", weak=False)
+        for _ in range(3):
+            louie.send_robust("sig")
+        assert self.breaker.state(flaky) == breaker.OPEN
+        self.breaker.reset(flaky)
+        assert self.breaker.state(flaky) == breaker.CLOSED
+
+    def test_send_unaffected(self):
+        flaky = Flaky()
+        louie.connect(flaky, "sig")
+        for _ in range(3):
+            louie.send_robust("sig")
+        self.assertRaises(ValueError, louie.send, "sig")
@@ -0,0 +1,120 @@
+import multiprocessing
+import pickle
+import time
+import unittest
+
+import louie
+from louie.bridge import BridgeReceiver, BridgeSender
+
+
+class Receiver(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, sender, value):
+        self.calls.append((sender, value))
+
+
+class SlowCodec(object):
+    """Pickle, slowly, and more slowly for smaller batches, so a partial
+    batch is still being encoded when a later full batch is ready."""
+
+    loads = staticmethod(pickle.loads)
+
+    @staticmethod
+    def dumps(batch):
+        time.sleep(0.002 / len(batch))
+        return pickle.dumps(batch)
+
+
+def _child(connection, count):
+    """Send ``count`` signals from a child process."""
+    bridge = BridgeSender(connection, ["sig"], sender_name=str, batch_size=8)
+    for value in range(count):
+        louie.send("sig", "child", value=value)
+    louie.send("other", "child", value=-1)
+    bridge.close()
+
+
+class TestBridge(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+
+    def test_batches(self):
+        left, right = multiprocessing.Pipe()
+        bridge = BridgeSender(left, ["sig"], batch_size=3, latency=60)
+        for value in range(3):
+            louie.send("sig", value=value)
+        assert bridge.batches == 1
+        louie.send("sig", value=3)
+        bridge.flush()
+        assert bridge.batches == 2
+        bridge.close()
+        receiver = Receiver()
+        louie.connect(receiver, "sig")
+        remote = BridgeReceiver(right)
+        assert remote.receive(1)
+        assert remote.receive(1)
+        assert remote.received == 4
+        assert receiver.calls == [(louie.Anonymous, value) for value in range(4)]
+
+    def test_latency(self):
+        left, right = multiprocessing.Pipe()
+        bridge = BridgeSender(left, ["sig"], batch_size=100, latency=0.01)
+        louie.send("sig", value=1)
+        remote = BridgeReceiver(right)
+        receiver = Receiver()
+        louie.connect(receiver, "sig")
+        assert remote.receive(5)
+        assert receiver.calls == [(louie.Anonymous, 1)]
+        bridge.close()
+
+    def test_no_echo(self):
+        left, right = multiprocessing.Pipe()
+        echo, _ = multiprocessing.Pipe()
+        bridge = BridgeSender(left, ["sig"], batch_size=1)
+        louie.send("sig", value=1)
+        bridge.close()
+        echo_bridge = BridgeSender(echo, ["sig"], batch_size=1)
+        remote = BridgeReceiver(right)
+        assert remote.receive(5)
+        assert echo_bridge.forwarded == 0
+        echo_bridge.close()
+
+    def test_order(self):
+        left, right = multiprocessing.Pipe()
+        bridge = BridgeSender(
+            left,
+            ["sig"],
+            sender_name=lambda sender: "remote",
+            codec=SlowCodec,
+            batch_size=4,
+            latency=0,
+        )
+        receiver = Receiver()
+        louie.connect(receiver, "sig", "remote")
+        remote = BridgeReceiver(right, codec=SlowCodec)
+        remote.start()
+        for value in range(200):
+            louie.send("sig", "local", value=value)
+            if not value % 3:
+                time.sleep(0.0005)
+        bridge.close()
+        remote.join(30)
+        assert receiver.calls == [("remote", value) for value in range(200)]
+
+    def test_process(self):
+        context = multiprocessing.get_context("spawn")
+        left, right = context.Pipe()
+        senders = {"child": object()}
+        receiver = Receiver()
+        louie.connect(receiver, "sig", senders["child"])
+        remote = BridgeReceiver(right, resolve_sender=senders.get)
+        remote.start()
+        process = context.Process(target=_child, args=(left, 20))
+        process.start()
+        left.close()
+        process.join(30)
+        remote.join(30)
+        assert process.exitcode == 0
+        assert receiver.calls == [(senders["child"], value) for value in range(20)]
@@ -0,0 +1,188 @@
+import threading
+import unittest
+import unittest.mock
+
+import louie
+from louie import error
+
+
+class Receiver(object):
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, sender, value):
+        with self.lock:
+            self.calls.append((sender, value))
+
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.bus = louie.EventBus(workers=4, batch=3)
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_per_sender_order(self):
+        receiver = Receiver()
+        louie.connect(receiver, "sig")
+        senders = ["a", "b", "c"]
+        for value in range(50):
+            for sender in senders:
+                self.bus.post("sig", sender, value=value)
+        assert self.bus.join(10)
+        assert len(receiver.calls) == 150
+        for sender in senders:
+            values = [value for s, value in receiver.calls if s == sender]
+            assert values == list(range(50))
+        assert self.bus.delivered == 150
+        assert self.bus.pending == 0
+        assert self.bus.depths() == {}
+
+    def test_post_returns_immediately(self):
+        gate = threading.Event()
+        calls = []
+
+        def slow(value):
+            gate.wait()
+            calls.append(value)
+
+        louie.connect(slow, "sig")
+        self.bus.post("sig", "a", value=1)
+        self.bus.post("sig", "a", value=2)
+        assert self.bus.pending == 2
+        assert self.bus.depths() == {"a": 2}
+        assert not self.bus.join(0.01)
+        gate.set()
+        assert self.bus.join(10)
+        assert calls == [1, 2]
+
+    def test_senders_in_parallel(self):
+        gate = threading.Event()
+        fast = []
+
+        def receiver(sender):
+            if sender == "slow":
+                gate.wait(10)
+            else:
+                fast.append(sender)
+                gate.set()
+
+        louie.connect(receiver, "sig")
+        self.bus.post("sig", "slow")
+        self.bus.post("sig", "fast")
+        assert self.bus.join(10)
+        assert fast == ["fast"]
+
+    def test_errors(self):
+        def failing():
+            raise ValueError("boom")
+
+        louie.connect(failing, "sig")
+        bus = louie.EventBus(workers=1, send=louie.send_minimal)
+        with unittest.mock.patch("traceback.print_exc"):
+            bus.post("sig")
+            assert bus.join(10)
+        assert bus.errors == 1
+        bus.shutdown()
+
+    def test_shutdown(self):
+        gate = threading.Event()
+        calls = []
+
+        def receiver(value):
+            gate.wait()
+            calls.append(value)
+
+        louie.connect(receiver, "sig")
+        for value in range(5):
+            self.bus.post("sig", "a", value=value)
+        gate.set()
+        self.bus.shutdown()
+        assert calls == list(range(5))
+        self.assertRaises(error.EventBusClosedError, self.bus.post, "sig")
+
+    def test_shutdown_discard(self):
+        gate = threading.Event()
+        calls = []
+
+        def receiver(value):
+            gate.wait()
+            calls.append(value)
+
+        louie.connect(receiver, "sig")
+        for value in range(5):
+            self.bus.post("sig", "a", value=value)
+        threading.Timer(0.05, gate.set).start()
+        self.bus.shutdown(drain=False)
+        assert len(calls) < 5
+        assert self.bus.pending == 0
+
+
+class TestPriorityBus(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        louie.connect(self.receiver, "sig")
+
+    def receiver(self, value):
+        self.started.set()
+        self.gate.wait(10)
+        self.calls.append(value)
+
+    def test_priority_order(self):
+        bus = louie.PriorityBus()
+        # Held up by the gate while the rest is queued.
+        bus.post("sig", value="first", priority=9)
+        self.started.wait(10)
+        for value, priority in [("c1", 3), ("a1", 1), ("b", 2), ("a2", 1), ("c2", 3)]:
+            assert bus.post("sig", value=value, priority=priority) is louie.Queued
+        self.gate.set()
+        assert bus.join(10)
+        assert self.calls == ["first", "a1", "a2", "b", "c1", "c2"]
+        latencies = bus.latencies()
+        assert sorted(latencies) == [1, 2, 3, 9]
+        count, mean, maximum = latencies[1]
+        assert count == 2
+        assert 0 <= mean <= maximum
+        bus.shutdown()
+
+    def test_capacity(self):
+        bus = louie.PriorityBus(capacity=2, overflow=louie.mailbox.DROP_NEWEST)
+        bus.post("sig", value=0)
+        self.started.wait(10)
+        bus.post("sig", value=1)
+        bus.post("sig", value=2)
+        assert bus.post("sig", value=3) is louie.Dropped
+        assert bus.dropped == 1
+        self.gate.set()
+        bus.shutdown()
+        assert self.calls == [0, 1, 2]
+
+    def test_capacity_timeout(self):
+        bus = louie.PriorityBus(capacity=1, timeout=0.01)
+        bus.post("sig", value=0)
+        self.started.wait(10)
+        bus.post("sig", value=1)
+        assert bus.post("sig", value=2) is louie.Dropped
+        self.gate.set()
+        bus.shutdown()
+        assert self.calls == [0, 1]
+
+    def test_shutdown(self):
+        bus = louie.PriorityBus()
+        bus.post("sig", value=0)
+        self.started.wait(10)
+        bus.post("sig", value=1)
+        threading.Timer(0.05, self.gate.set).start()
+        bus.shutdown(drain=False)
+        assert self.calls == [0]
+        self.assertRaises(error.EventBusClosedError, bus.post, "sig")
+
+    def test_overflow_policy(self):
+        self.assertRaises(
+            ValueError, louie.PriorityBus, overflow=louie.mailbox.DROP_OLDEST
+        )
@@ -0,0 +1,88 @@
+import threading
+import unittest
+
+import louie
+from louie import mailbox
+
+
+class Receiver(object):
+    def __init__(self):
+        self.args = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, arg):
+        self.gate.wait()
+        self.args.append(arg)
+
+
+class TestMailbox(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+
+    def test_queued(self):
+        receiver = Receiver()
+        connection = louie.connect(receiver, "sig", mailbox=10)
+        for arg in range(5):
+            assert louie.send("sig", arg=arg) == [(receiver, louie.Queued)]
+        assert connection.mailbox.join(5)
+        assert receiver.args == [0, 1, 2, 3, 4]
+        assert connection.mailbox.delivered == 5
+        assert connection.mailbox.depth == 0
+
+    def test_sender_not_blocked(self):
+        slow = Receiver()
+        slow.gate.clear()
+        fast = Receiver()
+        connection = louie.connect(slow, "sig", mailbox=10)
+        louie.connect(fast, "sig")
+        louie.send("sig", arg=1)
+        assert fast.args == [1]
+        assert slow.args == []
+        slow.gate.set()
+        assert connection.mailbox.join(5)
+        assert slow.args == [1]
+
+    def _fill(self, overflow):
+        receiver = Receiver()
+        receiver.gate.clear()
+        connection = louie.connect(
+            receiver, "sig", mailbox=2, overflow=overflow, timeout=0.01
+        )
+        responses = [louie.send("sig", arg=arg)[0][1] for arg in range(5)]
+        receiver.gate.set()
+        assert connection.mailbox.join(5)
+        return receiver, connection.mailbox, responses
+
+    def test_drop_newest(self):
+        receiver, box, responses = self._fill(mailbox.DROP_NEWEST)
+        assert louie.Dropped in responses
+        assert box.dropped == responses.count(louie.Dropped)
+        assert receiver.args == [
+            arg for arg in range(5) if responses[arg] is louie.Queued
+        ]
+        assert receiver.args[:2] == [0, 1]
+
+    def test_drop_oldest(self):
+        receiver, box, responses = self._fill(mailbox.DROP_OLDEST)
+        assert responses == [louie.Queued] * 5
+        assert box.dropped > 0
+        assert receiver.args[-2:] == [3, 4]
+
+    def test_block_timeout(self):
+        receiver, box, responses = self._fill(mailbox.BLOCK)
+        assert louie.Dropped in responses
+        assert box.dropped == responses.count(louie.Dropped)
+
+    def test_errors(self):
+        def fails():
+            raise ValueError("this")
+
+        connection = louie.connect(fails, "sig", mailbox=1)
+        louie.send("sig")
+        assert connection.mailbox.join(5)
+        assert connection.mailbox.errors == 1
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, mailbox.Mailbox, 0)
+        self.assertRaises(ValueError, mailbox.Mailbox, 1, "sometimes")
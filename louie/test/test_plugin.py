@@ -1,16 +1,15 @@
 """Louie plugin tests."""
 
+import asyncio
+import threading
+
 import louie
+from louie import dispatcher
 
 try:
-    import qt
-
-    if not hasattr(qt.qApp, "for_testing"):
-        _app = qt.QApplication([])
-        _app.for_testing = True
-        qt.qApp = _app
+    import twisted
 except ImportError:
-    qt = None
+    twisted = None
 
 
 class ReceiverBase(object):
@@ -112,35 +111,154 @@ def test_is_live():
     assert receiver2b.args == ["foo"]
 
 
-if qt is not None:
+class QtSignal(object):
+    """Stand-in for a Qt signal."""
+
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+
+class QObject(object):
+    """Stand-in for a Qt binding's QObject."""
+
+    def __init__(self):
+        self.deleted = False
+        self.destroyed = QtSignal()
+        self.args = []
+
+    def receive(self, arg):
+        if self.deleted:
+            raise RuntimeError("wrapped C/C++ object has been deleted")
+        self.args.append(arg)
+
+    def delete(self):
+        self.deleted = True
+        self.destroyed.emit(self)
 
-    def test_qt_plugin():
-        louie.reset()
 
-        # Create receivers.
-        class Receiver(qt.QWidget):
-            def __init__(self):
-                qt.QObject.__init__(self)
-                self.args = []
-
-            def receive(self, arg):
-                self.args.append(arg)
-
-        receiver1 = Receiver()
-        receiver2 = Receiver()
-        # Connect signals.
-        louie.connect(receiver1.receive, "sig")
-        louie.connect(receiver2.receive, "sig")
-        # Destroy receiver2 so only a shell is left.
-        receiver2.close(True)
-        # Check reception without plugins.
-        louie.send("sig", arg="foo")
-        assert receiver1.args == ["foo"]
-        assert receiver2.args == ["foo"]
-        # Install plugin.
-        plugin = louie.QtWidgetPlugin()
-        louie.install_plugin(plugin)
-        # Check reception with plugins.
-        louie.send("sig", arg="bar")
+def test_qt_plugin():
+    louie.reset()
+    checks = []
+
+    def is_deleted(obj):
+        checks.append(obj)
+        return obj.deleted
+
+    receiver1 = QObject()
+    receiver2 = QObject()
+    receiver3 = QObject()
+    louie.connect(receiver1.receive, "sig")
+    louie.connect(receiver2.receive, "sig")
+    louie.connect(receiver3.receive, "sig")
+    # Destroyed before the plugin first sees it.
+    receiver3.deleted = True
+    plugin = louie.QtWidgetPlugin(QObject, is_deleted)
+    louie.install_plugin(plugin)
+    louie.send("sig", arg="foo")
+    assert receiver1.args == ["foo"]
+    assert receiver2.args == ["foo"]
+    assert len(list(louie.get_all_receivers(signal="sig"))) == 2
+    # Liveness is cached rather than checked on every send.
+    louie.send("sig", arg="bar")
+    assert checks == [receiver1, receiver2, receiver3]
+    # Destroying an object disconnects its receivers.
+    receiver2.delete()
+    assert len(list(louie.get_all_receivers(signal="sig"))) == 1
+    louie.send("sig", arg="baz")
+    assert receiver1.args == ["foo", "bar", "baz"]
+    assert receiver2.args == ["foo", "bar"]
+
+
+def test_qt_plugin_builtin_method():
+    louie.reset()
+    receiver = QObject()
+    # A builtin method, with no __func__, as are the methods of the
+    # PyQt and PySide bindings.
+    method = receiver.__sizeof__
+    louie.connect(method, "sig", weak=False)
+    louie.install_plugin(louie.QtWidgetPlugin(QObject, lambda obj: obj.deleted))
+    receivers = louie.get_all_receivers(signal="sig")
+    assert list(dispatcher.live_receivers(receivers)) == [method]
+    receiver.delete()
+    assert list(louie.get_all_receivers(signal="sig")) == []
+
+
+if twisted is not None:
+
+    class Reactor(object):
+        """Reactor stub that runs delayed calls on demand."""
+
+        def __init__(self):
+            self.calls = []
+
+        def callLater(self, delay, function, *args, **kw):
+            self.calls.append((function, args, kw))
+
+        def iterate(self):
+            calls = self.calls
+            self.calls = []
+            for function, args, kw in calls:
+                function(*args, **kw)
+
+    def test_twisted_plugin():
+        louie.reset()
+        reactor = Reactor()
+        louie.install_plugin(louie.TwistedDispatchPlugin(reactor))
+        receiver1 = Receiver1()
+        receiver2 = Receiver2()
+        louie.connect(receiver1, "sig")
+        louie.connect(receiver2, "sig")
+        results = []
+        for arg in ("foo", "bar"):
+            for receiver, d in louie.send("sig", arg=arg):
+                d.addCallback(results.append)
+        # All four calls are made by a single reactor callback.
+        assert len(reactor.calls) == 1
+        assert receiver1.args == []
+        reactor.iterate()
         assert receiver1.args == ["foo", "bar"]
-        assert receiver2.args == ["foo"]
+        assert receiver2.args == ["foo", "bar"]
+        assert results == [None] * 4
+
+
+def test_asyncio_plugin():
+    louie.reset()
+    loop = asyncio.new_event_loop()
+    louie.install_plugin(louie.AsyncioDispatchPlugin(loop))
+    receiver = Receiver1()
+
+    async def coroutine_receiver(arg):
+        await asyncio.sleep(0)
+        return arg.upper()
+
+    def failing_receiver():
+        raise ValueError("this")
+
+    louie.connect(receiver, "sig")
+    louie.connect(coroutine_receiver, "sig")
+    louie.connect(failing_receiver, "sig")
+    futures = [response for r, response in louie.send("sig", arg="foo")]
+    # Calls are made from a thread, too.
+    thread = threading.Thread(
+        target=lambda: futures.extend(r for _, r in louie.send("sig", arg="bar"))
+    )
+    thread.start()
+    thread.join()
+    assert receiver.args == []
+    try:
+        results = loop.run_until_complete(
+            asyncio.gather(*futures, return_exceptions=True)
+        )
+    finally:
+        loop.close()
+    assert receiver.args == ["foo", "bar"]
+    assert results[:2] == [None, "FOO"]
+    assert isinstance(results[2], ValueError)
+    assert results[3:5] == [None, "BAR"]
@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import louie
+from louie.recorder import RecorderPlugin, Replayer
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 0.01
+        return self.now
+
+
+class Receiver(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, signal, sender, value=None):
+        self.calls.append((signal, sender, value))
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "signals.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _record(self, senders):
+        recorder = RecorderPlugin(self.path, sender_name=senders.index, clock=Clock())
+        louie.install_plugin(recorder)
+        louie.send("sig", value=1)
+        louie.send("sig", senders[0], value=2)
+        louie.send_robust("other", senders[1], value=3)
+        louie.send("sig", value=lambda: None)
+        louie.remove_plugin(recorder)
+        recorder.close()
+        return recorder
+
+    def test_record_replay(self):
+        senders = [object(), object()]
+        recorder = self._record(senders)
+        assert recorder.recorded == 3
+        assert recorder.skipped == 1
+        receiver = Receiver()
+        louie.connect(receiver)
+        replayer = Replayer(self.path, resolve_sender=senders.__getitem__)
+        records = list(replayer)
+        assert [record[0] for record in records] == [1000.01, 1000.02, 1000.03]
+        assert replayer.replay() == 3
+        replayer.close()
+        assert receiver.calls == [
+            ("sig", louie.Anonymous, 1),
+            ("sig", senders[0], 2),
+            ("other", senders[1], 3),
+        ]
+
+    def test_append(self):
+        senders = [object(), object()]
+        self._record(senders)
+        self._record(senders)
+        replayer = Replayer(self.path, resolve_sender=senders.__getitem__)
+        assert len(list(replayer)) == 6
+        replayer.close()
+
+    def test_replay_speed(self):
+        senders = [object(), object()]
+        self._record(senders)
+        replayer = Replayer(self.path, resolve_sender=senders.__getitem__)
+        sent = []
+        assert replayer.replay(speed=2.0, send=lambda *args, **kw: sent.append(args))
+        replayer.close()
+        assert len(sent) == 3
+
+    def test_send_functions(self):
+        recorder = RecorderPlugin(self.path)
+        louie.install_plugin(recorder)
+        louie.send_exact("sig", "name", value=1)
+        louie.send_batch("sig", "name", value=[2, 3])
+        louie.send_robust("sig", value=4)
+        louie.remove_plugin(recorder)
+        recorder.close()
+        replayer = Replayer(self.path)
+        assert [record[-1] for record in replayer] == [
+            "send_exact",
+            "send_batch",
+            "send_robust",
+        ]
+        receiver = Receiver()
+        louie.connect(receiver, "sig", "name")
+        louie.connect(receiver, "sig")
+        assert replayer.replay() == 3
+        replayer.close()
+        # Senders keyed by value are replayed as themselves, and the
+        # batch is received row by row.
+        assert receiver.calls == [
+            ("sig", "name", 1),
+            ("sig", "name", 2),
+            ("sig", "name", 3),
+            ("sig", louie.Anonymous, 4),
+        ]
+
+    def test_send_functions_subclass(self):
+        class Recorder(RecorderPlugin):
+            def on_send(self, signal, sender, arguments, named):
+                super().on_send(signal, sender, arguments, named)
+
+        recorder = Recorder(self.path)
+        louie.install_plugin(recorder)
+        louie.send_exact("sig", value=1)
+        louie.remove_plugin(recorder)
+        # Called outside of a send.
+        recorder.on_send("sig", louie.Anonymous, (), {"value": 2})
+        recorder.close()
+        replayer = Replayer(self.path)
+        assert [record[-1] for record in replayer] == ["send_exact", "send"]
+        replayer.close()
+        assert louie.dispatcher.send_function() is None
+
+    def test_not_a_log(self):
+        with open(self.path, "wb") as file:
+            file.write(b"something else")
+        self.assertRaises(ValueError, Replayer, self.path)
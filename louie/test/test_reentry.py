@@ -0,0 +1,124 @@
+import unittest
+
+import louie
+from louie import error, reentry
+from louie.reentry import ReentrancyPlugin
+from louie.trace import TracePlugin
+
+
+class Receiver(object):
+    """Receiver sending its signal again from within itself."""
+
+    def __init__(self, times=1):
+        self.values = []
+        self.times = times
+
+    def __call__(self, signal, value):
+        self.values.append(value)
+        if value < self.times:
+            louie.send(signal, value=value + 1)
+
+
+class TestReentrancy(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+
+    def tearDown(self):
+        louie.reset()
+
+    def test_allow(self):
+        plugin = ReentrancyPlugin()
+        louie.install_plugin(plugin)
+        receiver = Receiver(times=3)
+        louie.connect(receiver, "sig")
+        louie.send("sig", value=0)
+        assert receiver.values == [0, 1, 2, 3]
+        assert plugin.allowed == 3
+
+    def test_skip(self):
+        plugin = ReentrancyPlugin(signals={"sig": reentry.SKIP})
+        louie.install_plugin(plugin)
+        receiver = Receiver()
+        other = Receiver(times=0)
+        louie.connect(receiver, "sig")
+        louie.connect(other, "sig")
+        louie.send("sig", value=0)
+        assert receiver.values == [0]
+        # The other receiver of the signal is skipped while it is being
+        # handled too.
+        assert other.values == [0]
+        assert plugin.skipped == 2
+
+    def test_defer(self):
+        order = []
+        plugin = ReentrancyPlugin(policy=reentry.DEFER)
+        louie.install_plugin(plugin)
+
+        def receiver(value):
+            order.append(("start", value))
+            if value < 2:
+                response = louie.send("sig", value=value + 1)
+                assert response[0][1] is louie.Deferred
+            order.append(("end", value))
+
+        louie.connect(receiver, "sig")
+        louie.send("sig", value=0)
+        assert order == [
+            ("start", 0),
+            ("end", 0),
+            ("start", 1),
+            ("end", 1),
+            ("start", 2),
+            ("end", 2),
+        ]
+        assert plugin.deferred == 2
+
+    def test_defer_after_send(self):
+        order = []
+        louie.install_plugin(ReentrancyPlugin(policy=reentry.DEFER))
+
+        def a(value):
+            order.append(("a", value))
+            if value == 0:
+                louie.send("x", value=1)
+
+        def b(value):
+            order.append(("b", value))
+
+        louie.connect(a, "x")
+        louie.connect(b, "x")
+        louie.send("x", value=0)
+        assert order == [("a", 0), ("b", 0), ("a", 1), ("b", 1)]
+
+    def test_raise(self):
+        plugin = ReentrancyPlugin()
+        louie.install_plugin(plugin)
+        receiver = Receiver()
+        plugin.set_policy(receiver, reentry.RAISE)
+        louie.connect(receiver, "sig")
+        self.assertRaises(error.ReentrancyError, louie.send, "sig", value=0)
+        assert plugin.raised == 1
+        plugin.set_policy(receiver, None)
+        louie.send("sig", value=0)
+
+    def test_wrapped(self):
+        louie.install_plugin(TracePlugin())
+        plugin = ReentrancyPlugin()
+        louie.install_plugin(plugin)
+        receiver = Receiver()
+        plugin.set_policy(receiver, reentry.RAISE)
+        louie.connect(receiver, "sig")
+        self.assertRaises(error.ReentrancyError, louie.send, "sig", value=0)
+        assert plugin.raised == 1
+
+    def test_max_depth(self):
+        plugin = ReentrancyPlugin(max_depth=3)
+        louie.install_plugin(plugin)
+        receiver = Receiver(times=10)
+        louie.connect(receiver, "sig")
+        self.assertRaises(error.ReentrancyError, louie.send, "sig", value=0)
+        assert receiver.values == [0, 1, 2]
+        assert plugin.too_deep == 1
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, ReentrancyPlugin, policy="sometimes")
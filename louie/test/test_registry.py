@@ -0,0 +1,117 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import louie
+from louie import registry
+
+MODULE = """
+calls = []
+
+def handler(value):
+    calls.append(value)
+"""
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        registry.registry.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directory.name, "lazy_receivers.py"), "w") as f:
+            f.write(MODULE)
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        sys.modules.pop("lazy_receivers", None)
+        self.directory.cleanup()
+        registry.registry.clear()
+        louie.reset()
+
+    def test_decorator(self):
+        calls = []
+
+        @louie.receiver("sig")
+        def handler(value):
+            calls.append(value)
+
+        assert louie.dispatcher.connections == {}
+        louie.send("sig", value=1)
+        assert calls == [1]
+        assert len(registry.registry) == 0
+        louie.send("sig", value=2)
+        assert calls == [1, 2]
+
+    def test_uninstall(self):
+        calls = []
+
+        @louie.receiver("sig")
+        def handler(value):
+            calls.append(value)
+
+        bound = louie.bind("sig")
+        assert registry.registry in louie.dispatcher.plugins
+        bound(value=1)
+        assert registry.registry not in louie.dispatcher.plugins
+        bound(value=2)
+        assert calls == [1, 2]
+
+    def test_reset(self):
+        @louie.receiver("sig")
+        def forgotten(value):
+            raise AssertionError("not connected")
+
+        louie.reset()
+        assert len(registry.registry) == 0
+        calls = []
+
+        @louie.receiver("sig")
+        def handler(value):
+            calls.append(value)
+
+        louie.send("sig", value=1)
+        assert calls == [1]
+
+    def test_path(self):
+        louie.register(
+            [
+                ("lazy_receivers:handler", "sig"),
+                ("lazy_receivers.handler", "other"),
+            ]
+        )
+        louie.send("unrelated")
+        assert "lazy_receivers" not in sys.modules
+        louie.send("sig", value=1)
+        module = sys.modules["lazy_receivers"]
+        assert module.calls == [1]
+        assert len(registry.registry) == 1
+        louie.send("other", value=2)
+        assert module.calls == [1, 2]
+
+    def test_sender(self):
+        sender = object()
+        calls = []
+
+        @louie.receiver("sig", sender)
+        def handler(value):
+            calls.append(value)
+
+        louie.send("sig", value=1)
+        assert len(registry.registry) == 1
+        louie.send("sig", sender, value=2)
+        assert calls == [2]
+        assert len(registry.registry) == 0
+
+    def test_value_sender(self):
+        louie.register([("lazy_receivers:handler", "sig", "sender")])
+        louie.send("sig", "".join(["sen", "der"]), value=1)
+        assert sys.modules["lazy_receivers"].calls == [1]
+        assert len(registry.registry) == 0
+        assert registry.registry not in louie.dispatcher.plugins
+
+    def test_import_error(self):
+        louie.register([("lazy_receivers:missing", "sig")])
+        self.assertRaises(AttributeError, louie.send, "sig")
+        assert len(registry.registry) == 1
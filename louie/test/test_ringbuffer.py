@@ -0,0 +1,118 @@
+import multiprocessing
+import threading
+import unittest
+
+import louie
+
+try:
+    from louie.ringbuffer import RingBuffer, RingReceiver, RingSender
+except ImportError:
+    # multiprocessing.shared_memory needs Python 3.8 or higher.
+    RingBuffer = None
+
+
+class Receiver(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, sender, value, data=None):
+        if data is not None:
+            data = bytes(data)
+        self.calls.append((sender, value, data))
+
+
+def _child(name, count):
+    """Send ``count`` signals from a child process."""
+    ring = RingBuffer(name)
+    sender = RingSender(ring, ["sig"], sender_name=str, payload="data")
+    for value in range(count):
+        louie.send("sig", "child", value=value, data=bytes([value % 256]) * 100)
+    sender.close()
+    ring.close()
+
+
+@unittest.skipUnless(RingBuffer, "needs multiprocessing.shared_memory")
+class TestRingBuffer(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.ring = RingBuffer(slots=4, record_size=128)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_put_peek(self):
+        ring = self.ring
+        assert ring.peek() is None
+        for index in range(4):
+            assert ring.try_put(b"header%d" % index, b"payload")
+        assert not ring.try_put(b"full")
+        assert len(ring) == 4
+        header, payload = ring.peek()
+        assert bytes(header) == b"header0"
+        assert bytes(payload) == b"payload"
+        del header, payload
+        ring.release()
+        assert ring.try_put(b"header4")
+        assert not ring.put(b"full", timeout=0.01)
+        self.assertRaises(ValueError, ring.try_put, b"x" * 200)
+
+    def test_forward(self):
+        sender = RingSender(self.ring, ["sig"], payload="data")
+        receiver = Receiver()
+        louie.connect(receiver, "sig")
+        remote = RingReceiver(self.ring, payload="data")
+        for value in range(3):
+            louie.send("sig", value=value, data=b"abc")
+        # The local receiver got the signals directly.
+        assert len(receiver.calls) == 3
+        del receiver.calls[:]
+        sender.close()
+        assert remote.receive() == 3
+        assert receiver.calls == [
+            (louie.Anonymous, value, b"abc") for value in range(3)
+        ]
+
+    def test_full_ring_drops_with_timeout(self):
+        sender = RingSender(self.ring, ["sig"], timeout=0)
+        for value in range(6):
+            louie.send("sig", value=value)
+        assert sender.forwarded == 4
+        assert sender.dropped == 2
+        sender.close()
+
+    def test_threads(self):
+        ring = RingBuffer(slots=4096, record_size=64)
+        sender = RingSender(ring, ["sig"])
+
+        def send(start):
+            for value in range(start, start + 1000):
+                louie.send("sig", value=value)
+
+        threads = [threading.Thread(target=send, args=(n * 1000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sender.close()
+        receiver = Receiver()
+        louie.connect(receiver, "sig")
+        assert RingReceiver(ring).receive() == 4000
+        ring.close()
+        assert sorted(value for _, value, _ in receiver.calls) == list(range(4000))
+
+    def test_process(self):
+        ring = RingBuffer(slots=64, record_size=256)
+        senders = {"child": object()}
+        receiver = Receiver()
+        louie.connect(receiver, "sig", senders["child"])
+        remote = RingReceiver(ring, resolve_sender=senders.get, payload="data")
+        remote.start()
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(target=_child, args=(ring.name, 1000))
+        process.start()
+        process.join(30)
+        remote.stop()
+        ring.close()
+        assert process.exitcode == 0
+        assert len(receiver.calls) == 1000
+        assert receiver.calls[5] == (senders["child"], 5, bytes([5]) * 100)
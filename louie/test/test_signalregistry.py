@@ -0,0 +1,84 @@
+import gc
+import unittest
+
+import louie
+from louie import dispatcher, error
+from louie.signalregistry import SignalRegistry
+
+
+class Sender(object):
+    pass
+
+
+class TestSignalRegistry(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.calls = []
+
+    def receiver(self, signal, value):
+        self.calls.append((signal, value))
+
+    def test_ids(self):
+        registry = SignalRegistry(["a", "b"])
+        assert registry.register("c") == 2
+        assert registry.register("a") == 0
+        assert registry.id("b") == 1
+        assert registry.signals == ["a", "b", "c"]
+        assert "c" in registry
+        assert len(registry) == 3
+        self.assertRaises(error.DispatcherKeyError, registry.id, "d")
+        self.assertRaises(error.DispatcherTypeError, registry.register, louie.All)
+
+    def test_send(self):
+        registry = SignalRegistry()
+        changed = registry.register("changed")
+        sender = Sender()
+        louie.connect(self.receiver, "changed", sender)
+        louie.connect(self.receiver, louie.All, weak=False)
+        responses = registry.send(changed, sender, value=1)
+        assert len(responses) == 2
+        assert self.calls == [("changed", 1)] * 2
+        # Signals registered later extend the sender's list.
+        closed = registry.register("closed")
+        registry.send(closed, sender, value=2)
+        assert self.calls[2:] == [("closed", 2)]
+        louie.disconnect(self.receiver, louie.All, weak=False)
+        registry.send(changed, sender, value=3)
+        assert self.calls[3:] == [("changed", 3)]
+
+    def test_sender_death(self):
+        registry = SignalRegistry(["changed"])
+        sender = Sender()
+        louie.connect(self.receiver, "changed", sender)
+        registry.send(0, sender, value=1)
+        assert list(dispatcher.id_routes) == [id(sender)]
+        del sender
+        gc.collect()
+        assert dispatcher.id_routes == {}
+
+    def test_value_senders(self):
+        registry = SignalRegistry(["changed"])
+        louie.connect(self.receiver, "changed", weak=False)
+        for index in range(1000):
+            registry.send(0, f"sender{index}", value=index)
+        assert len(self.calls) == 1000
+        # Senders without connections of their own share a list.
+        assert dispatcher.id_routes == {}
+        assert list(registry._shared) == [str]
+        louie.set_sender_limits(max_senders=2)
+        for index in range(1000):
+            name = f"sender{index}"
+            louie.connect(self.receiver, "other", name, weak=False)
+            registry.send(0, name, value=index)
+        assert len(self.calls) == 2000
+        assert list(dispatcher.id_routes) == list(dispatcher.value_senders)
+        assert len(dispatcher.id_routes) == 2
+        registry.clear()
+        assert all(not tables for tables in dispatcher.id_routes.values())
+
+    def test_fallback(self):
+        registry = SignalRegistry(["changed"])
+        louie.connect(self.receiver, "changed", where={"value": 2})
+        registry.send(0, value=1)
+        registry.send(0, value=2)
+        assert self.calls == [("changed", 2)]
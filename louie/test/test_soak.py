@@ -0,0 +1,135 @@
+"""Soak tests checking that the routing tables and saferef caches do
+not grow when connections are made and dropped repeatedly.
+
+Each test runs an operation many times under ``tracemalloc`` after a
+warm-up, and fails if memory grows by more than a small number of
+bytes per iteration.  Each test prints its growth rate, shown by
+``pytest -s``, and the rate is part of the failure message.
+
+The number of iterations defaults to a few thousand to keep the suite
+fast, and can be raised for a longer soak by setting the
+``LOUIE_SOAK_ITERATIONS`` environment variable::
+
+    LOUIE_SOAK_ITERATIONS=1000000 python -m pytest -s louie/test/test_soak.py
+"""
+
+import gc
+import os
+import tracemalloc
+import unittest
+
+import louie
+from louie import dispatcher, saferef
+
+WARMUP = 200
+ITERATIONS = int(os.environ.get("LOUIE_SOAK_ITERATIONS", 2000))
+# Allowed growth, in bytes per iteration.
+RATE = 8
+
+
+class Receiver(object):
+    def method(self, value=None):
+        pass
+
+
+class Sender(object):
+    pass
+
+
+def growth(operation, iterations=ITERATIONS):
+    """Return the memory growth of ``operation`` in bytes per
+    iteration."""
+    for _ in range(WARMUP):
+        operation()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(iterations):
+            operation()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / iterations
+
+
+class TestSoak(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+
+    def tearDown(self):
+        louie.reset()
+
+    def assert_bounded(self, operation):
+        rate = growth(operation)
+        print(f"{self.id()}: {rate:.2f} bytes per iteration, {ITERATIONS} iterations")
+        assert rate < RATE, f"grew by {rate:.1f} bytes per iteration"
+
+    def assert_clean(self):
+        assert dispatcher.connections == {}
+        assert dispatcher.senders == {}
+        assert dispatcher.senders_back == {}
+        assert dispatcher.value_senders == {}
+        assert len(saferef.BoundMethodWeakref._all_instances) == 0
+
+    def test_transient_receivers(self):
+        def operation():
+            receiver = Receiver()
+            louie.connect(receiver.method, "sig")
+            louie.send("sig", value=1)
+
+        self.assert_bounded(operation)
+        self.assert_clean()
+
+    def test_transient_senders(self):
+        self.receiver = Receiver()
+
+        def operation():
+            sender = Sender()
+            louie.connect(self.receiver.method, "sig", sender)
+            louie.send("sig", sender, value=1)
+
+        self.assert_bounded(operation)
+        del self.receiver
+        self.assert_clean()
+
+    def test_reconnect(self):
+        self.receiver = Receiver()
+        # Keeps the same BoundMethodWeakref in use throughout.
+        louie.connect(self.receiver.method, "keep")
+
+        def operation():
+            louie.connect(self.receiver.method, "sig")
+            louie.send("sig", value=1)
+            louie.disconnect(self.receiver.method, "sig")
+
+        self.assert_bounded(operation)
+        reference = saferef.safe_ref(self.receiver.method)
+        # Each reference to the method used to append to this list.
+        assert reference.deletion_methods == [dispatcher._remove_receiver]
+        del reference, self.receiver
+        self.assert_clean()
+
+    def test_value_senders(self):
+        self.receiver = Receiver()
+        louie.set_sender_limits(max_senders=10)
+        count = iter(range(10**9))
+
+        def operation():
+            louie.connect(self.receiver.method, "sig", next(count))
+
+        self.assert_bounded(operation)
+        assert len(dispatcher.value_senders) == 10
+        assert dispatcher.evictions == WARMUP + ITERATIONS - 10
+        louie.set_sender_limits(ttl=-1)
+        del self.receiver
+        self.assert_clean()
+
+    def test_transient_lambdas(self):
+        def operation():
+            louie.connect(lambda value: None, "sig")
+            louie.send("sig", value=1)
+
+        self.assert_bounded(operation)
+        self.assert_clean()
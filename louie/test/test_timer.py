@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+import louie
+from louie import error
+from louie.timer import TimerWheel
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Receiver(object):
+    def __init__(self):
+        self.values = []
+        self.event = threading.Event()
+
+    def __call__(self, value):
+        self.values.append(value)
+        self.event.set()
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.receiver = Receiver()
+        louie.connect(self.receiver, "sig")
+
+    def test_send_later(self):
+        wheel = TimerWheel(resolution=0.001)
+        timer = wheel.send_later(0.01, "sig", value=1)
+        assert timer.active
+        assert self.receiver.event.wait(5)
+        assert self.receiver.values == [1]
+        assert not timer.active
+        assert not timer.cancel()
+        assert len(wheel) == 0
+        wheel.shutdown()
+
+    def test_send_every(self):
+        wheel = TimerWheel(resolution=0.001)
+        timer = wheel.send_every(0.002, "sig", value=1)
+        deadline = time.monotonic() + 5
+        while len(self.receiver.values) < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert timer.cancel()
+        assert not timer.active
+        count = len(self.receiver.values)
+        assert count >= 3
+        time.sleep(0.02)
+        assert len(self.receiver.values) <= count + 1
+        wheel.shutdown()
+
+    def test_order(self):
+        clock = Clock()
+        sent = []
+        wheel = TimerWheel(
+            resolution=1, slots=4, levels=2, clock=clock, send=lambda *a, **kw: None
+        )
+        # Drive the wheel by hand, without its thread.
+        wheel._thread = threading.current_thread()
+        delays = [100, 3, 17, 1, 16, 4, 5, 64, 15, 2]
+        for delay in delays:
+            wheel.send_later(delay, "sig", value=delay)
+        assert len(wheel) == len(delays)
+        while len(wheel):
+            tick = wheel._next_tick()
+            for timer in wheel._expire(tick):
+                assert timer.due == tick
+                sent.append(timer.named["value"])
+        assert sent == sorted(delays)
+
+    def test_cancel_many(self):
+        clock = Clock()
+        wheel = TimerWheel(clock=clock)
+        wheel._thread = threading.current_thread()
+        timers = [
+            wheel.send_later(delay * 0.001, "sig", value=delay)
+            for delay in range(100000)
+        ]
+        assert len(wheel) == 100000
+        for timer in timers[::2]:
+            assert timer.cancel()
+        assert len(wheel) == 50000
+        for timer in timers[1::2]:
+            assert timer.cancel()
+        assert len(wheel) == 0
+
+    def test_shutdown(self):
+        wheel = TimerWheel()
+        timer = wheel.send_later(60, "sig", value=1)
+        wheel.shutdown()
+        assert not timer.active
+        self.assertRaises(
+            error.TimerWheelClosedError, wheel.send_later, 1, "sig", value=1
+        )
+
+    def test_module_functions(self):
+        timer = louie.send_later(0.001, "sig", value=2)
+        assert isinstance(timer, louie.Timer)
+        assert self.receiver.event.wait(5)
+        assert self.receiver.values == [2]
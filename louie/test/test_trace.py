@@ -0,0 +1,111 @@
+import io
+import json
+import random
+import threading
+import unittest
+
+import louie
+from louie.trace import TracePlugin
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+        self.plugin = TracePlugin()
+        louie.install_plugin(self.plugin)
+
+    def tearDown(self):
+        louie.reset()
+
+    def spans(self):
+        return {span.name: span for span in self.plugin.spans}
+
+    def test_tree(self):
+        def outer():
+            louie.send("inner")
+
+        def inner():
+            pass
+
+        def other():
+            pass
+
+        louie.connect(outer, "outer")
+        louie.connect(other, "outer")
+        louie.connect(inner, "inner")
+        louie.send("outer")
+        spans = self.spans()
+        assert len(spans) == 5
+        assert spans["outer"].parent is None
+        assert spans["outer"].kind == "send"
+        assert spans[outer.__qualname__].parent == spans["outer"].id
+        assert spans[other.__qualname__].parent == spans["outer"].id
+        assert spans["inner"].parent == spans[outer.__qualname__].id
+        assert spans[inner.__qualname__].parent == spans["inner"].id
+        assert spans["outer"].end >= spans[other.__qualname__].end
+        louie.send("inner")
+        assert list(self.plugin.spans)[-2].parent is None
+
+    def test_mailbox(self):
+        done = threading.Event()
+
+        def receiver():
+            louie.send("inner")
+            done.set()
+
+        louie.connect(receiver, "outer", mailbox=1)
+        louie.send("outer")
+        assert done.wait(5)
+        spans = self.spans()
+        assert spans[receiver.__qualname__].parent == spans["outer"].id
+        assert spans["inner"].parent == spans[receiver.__qualname__].id
+
+    def test_bus(self):
+        bus = louie.EventBus(workers=2)
+
+        def outer():
+            bus.post("inner")
+
+        louie.connect(outer, "outer")
+        louie.send("outer")
+        bus.shutdown()
+        spans = self.spans()
+        assert spans["inner"].parent == spans[outer.__qualname__].id
+
+    def test_sampling(self):
+        self.plugin.rate = 0.0
+        louie.connect(lambda: None, "sig", weak=False)
+        louie.send("sig")
+        assert not self.plugin.spans
+
+    def test_sampling_inherited(self):
+        self.plugin.rate = 0.5
+        random.seed(0)
+
+        def outer():
+            louie.send("inner")
+
+        louie.connect(outer, "outer")
+        louie.connect(lambda: None, "inner", weak=False)
+        for _ in range(100):
+            louie.send("outer")
+        spans = list(self.plugin.spans)
+        ids = {span.id for span in spans}
+        roots = [span for span in spans if span.parent is None]
+        assert 0 < len(roots) < 100
+        assert all(span.name == "outer" for span in roots)
+        assert all(span.parent in ids for span in spans if span.parent is not None)
+        assert len(spans) == 4 * len(roots)
+
+    def test_export(self):
+        louie.connect(lambda: None, "sig", weak=False)
+        louie.send("sig")
+        stream = io.StringIO()
+        self.plugin.export_json(stream)
+        spans = json.loads(stream.getvalue())
+        assert [span["kind"] for span in spans] == ["send", "receive"]
+        stream = io.StringIO()
+        self.plugin.export_chrome_trace(stream)
+        events = json.loads(stream.getvalue())["traceEvents"]
+        assert [event["cat"] for event in events] == ["send", "receive"]
+        assert events[1]["args"]["parent"] == events[0]["args"]["id"]
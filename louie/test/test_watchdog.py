@@ -0,0 +1,116 @@
+import threading
+import unittest
+
+import louie
+from louie.trace import TracePlugin
+from louie.watchdog import WatchdogPlugin
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        louie.reset()
+
+    def tearDown(self):
+        for plugin in louie.dispatcher.plugins:
+            if isinstance(plugin, WatchdogPlugin):
+                plugin.stop()
+        louie.reset()
+
+    def test_returned(self):
+        clock = Clock()
+        plugin = WatchdogPlugin(
+            threshold=1.0, thresholds={"fast": 0.1}, interval=None, clock=clock
+        )
+        louie.install_plugin(plugin)
+
+        def slow():
+            clock.now += 0.5
+
+        louie.connect(slow, "sig")
+        louie.connect(slow, "fast")
+        louie.send("sig")
+        assert not plugin.reports
+        louie.send("fast")
+        [report] = plugin.reports
+        assert report.receiver == slow.__qualname__
+        assert report.signal == "fast"
+        assert report.elapsed == 0.5
+        assert not report.running
+
+    def test_wrapped(self):
+        clock = Clock()
+        louie.install_plugin(TracePlugin())
+        plugin = WatchdogPlugin(threshold=0.1, interval=None, clock=clock)
+        louie.install_plugin(plugin)
+
+        def slow():
+            clock.now += 0.5
+
+        louie.connect(slow, "sig")
+        louie.send("sig")
+        [report] = plugin.reports
+        assert report.receiver == slow.__qualname__
+
+    def test_nested_signal(self):
+        clock = Clock()
+        plugin = WatchdogPlugin(threshold=0.1, interval=None, clock=clock)
+        louie.install_plugin(plugin)
+
+        def outer():
+            louie.send("inner")
+            clock.now += 1
+
+        louie.connect(outer, "outer")
+        louie.connect(lambda: None, "inner", weak=False)
+        louie.send("outer")
+        [report] = plugin.reports
+        assert report.signal == "outer"
+
+    def test_running(self):
+        reports = []
+        reported = threading.Event()
+        gate = threading.Event()
+
+        def callback(report):
+            reports.append(report)
+            reported.set()
+
+        plugin = WatchdogPlugin(
+            threshold=0.01, callback=callback, interval=0.005, sample_stack=True
+        )
+        louie.install_plugin(plugin)
+
+        def hanging():
+            gate.wait(10)
+
+        louie.connect(hanging, "sig")
+        thread = threading.Thread(target=louie.send, args=("sig",))
+        thread.start()
+        assert reported.wait(10)
+        gate.set()
+        thread.join()
+        [report] = reports
+        assert report.running
+        assert report.elapsed > 0.01
+        assert "gate.wait" in "".join(report.stack)
+
+    def test_stop(self):
+        plugin = WatchdogPlugin(threshold=0.01, interval=0.005)
+        louie.install_plugin(plugin)
+        louie.connect(lambda: None, "sig", weak=False)
+        louie.send("sig")
+        assert plugin._thread is not None
+        plugin.stop()
+        assert plugin._thread is None
+        louie.send("sig")
+        assert plugin._thread is None
@@ -0,0 +1,316 @@
+"""Delayed and periodic sends.
+
+``send_later`` sends a signal after a delay and ``send_every`` sends
+it repeatedly at an interval.  Both return a ``Timer`` handle which
+can be cancelled.
+
+Timers are kept in a hierarchical timer wheel driven by a single
+thread.  Time is divided into ticks of ``resolution`` seconds.  Level
+0 of the wheel has one bucket per tick for the next ``slots`` ticks,
+and each higher level has buckets covering ``slots`` times as many
+ticks as the level below.  When the current tick reaches a higher
+level bucket, its timers are moved down to the lower levels.  Adding
+and cancelling a timer take constant time, whatever the number of
+pending timers.
+
+The signal's sender and arguments are held by the timer until it is
+cancelled or, for ``send_later``, until the signal is sent.  The
+signal is sent in a copy of the ``contextvars`` context of the code
+which scheduled it.
+"""
+
+import contextvars
+import math
+import threading
+import time
+import traceback
+
+from louie import dispatcher, error
+from louie.sender import Anonymous
+from louie.signal import All
+
+
+class Timer(object):
+    """Handle of a scheduled send, returned by ``send_later`` and
+    ``send_every``."""
+
+    __slots__ = (
+        "due",
+        "context",
+        "interval",
+        "signal",
+        "sender",
+        "arguments",
+        "named",
+        "_wheel",
+        "_bucket",
+        "_level",
+    )
+
+    def __init__(self, wheel, interval, signal, sender, arguments, named):
+        self.due = None
+        self.context = contextvars.copy_context()
+        self.interval = interval
+        self.signal = signal
+        self.sender = sender
+        self.arguments = arguments
+        self.named = named
+        self._wheel = wheel
+        self._bucket = None
+        self._level = None
+
+    def __repr__(self):
+        state = "active" if self.active else "inactive"
+        return f"<{self.__class__.__name__} {self.signal!r} {state}>"
+
+    @property
+    def active(self):
+        """Whether the signal will still be sent."""
+        return self._bucket is not None
+
+    def cancel(self):
+        """Stop the signal from being sent.
+
+        Returns False if the timer was no longer active.
+        """
+        return self._wheel._cancel(self)
+
+
+class TimerWheel(object):
+    """Send signals at scheduled times from a single thread.
+
+    - ``resolution``: Length of a tick, in seconds.  Signals are sent
+      at the first tick at or after their scheduled time.
+
+    - ``slots``: Number of buckets per level, a power of 2.
+
+    - ``levels``: Number of levels.  Timers further away than
+      ``slots ** levels`` ticks are moved down in several steps.
+
+    - ``send``: The send function to use, ``dispatcher.send`` by
+      default.  Exceptions raised by it are counted in ``errors`` and
+      their traceback is printed.
+
+    - ``clock``: Monotonic clock callable, in seconds.
+
+    The thread is started when the first timer is scheduled.
+    """
+
+    def __init__(
+        self,
+        resolution=0.001,
+        slots=256,
+        levels=4,
+        send=None,
+        clock=time.monotonic,
+    ):
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"Timer wheel slots must be a power of 2, not {slots!r}")
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.send = dispatcher.send if send is None else send
+        self.clock = clock
+        self.fired = 0
+        self.errors = 0
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        # Buckets are dictionaries used as insertion ordered sets.
+        self._wheel = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._start = clock()
+        # The last tick processed.
+        self._tick = 0
+        # The tick the thread sleeps until, None when sleeping with no
+        # timers, -1 when not sleeping.
+        self._wake = -1
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def __len__(self):
+        return sum(self._counts)
+
+    def send_later(self, delay, signal=All, sender=Anonymous, *arguments, **named):
+        """Send ``signal`` after ``delay`` seconds, with the same
+        arguments as ``dispatcher.send``.  Returns a ``Timer``."""
+        timer = Timer(self, None, signal, sender, arguments, named)
+        self._schedule(timer, delay)
+        return timer
+
+    def send_every(self, interval, signal=All, sender=Anonymous, *arguments, **named):
+        """Send ``signal`` every ``interval`` seconds, starting after
+        ``interval`` seconds, with the same arguments as
+        ``dispatcher.send``.  Returns a ``Timer``."""
+        ticks = max(1, math.ceil(interval / self.resolution))
+        timer = Timer(self, ticks, signal, sender, arguments, named)
+        self._schedule(timer, interval)
+        return timer
+
+    def shutdown(self):
+        """Cancel all timers and stop the thread.
+
+        Scheduling afterwards raises ``TimerWheelClosedError``.
+        """
+        with self._condition:
+            self._closed = True
+            for level in self._wheel:
+                for bucket in level:
+                    for timer in bucket:
+                        timer._bucket = None
+                    bucket.clear()
+            self._counts = [0] * self.levels
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _now(self):
+        return int((self.clock() - self._start) / self.resolution)
+
+    def _schedule(self, timer, delay):
+        ticks = max(1, math.ceil(delay / self.resolution))
+        with self._condition:
+            if self._closed:
+                raise error.TimerWheelClosedError(
+                    f"Cannot schedule signal {timer.signal!r} on a closed timer wheel"
+                )
+            now = self._now()
+            if not any(self._counts):
+                # Nothing to process while idle, so catch up.
+                self._tick = max(self._tick, now)
+            timer.due = max(self._tick, now) + ticks
+            self._insert(timer)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="louie-timer-wheel", daemon=True
+                )
+                self._thread.start()
+            elif self._wake is None or timer.due < self._wake:
+                self._condition.notify()
+
+    def _insert(self, timer):
+        delta = timer.due - self._tick
+        if delta <= 0:
+            # Due now; only happens while processing the current tick.
+            level = 0
+            index = self._tick & self._mask
+        else:
+            level = min((delta.bit_length() - 1) // self._bits, self.levels - 1)
+            index = (timer.due >> (self._bits * level)) & self._mask
+        bucket = self._wheel[level][index]
+        bucket[timer] = None
+        timer._bucket = bucket
+        timer._level = level
+        self._counts[level] += 1
+
+    def _cancel(self, timer):
+        with self._condition:
+            bucket = timer._bucket
+            if bucket is None:
+                return False
+            del bucket[timer]
+            timer._bucket = None
+            self._counts[timer._level] -= 1
+            return True
+
+    def _next_tick(self):
+        """Return the next tick that needs processing, skipping ticks
+        of empty levels, or None if there are no timers."""
+        for level, count in enumerate(self._counts):
+            if count:
+                span = 1 << (self._bits * level)
+                return (self._tick // span + 1) * span
+        return None
+
+    def _expire(self, tick):
+        """Advance to ``tick`` and return the timers due."""
+        self._tick = tick
+        bits = self._bits
+        for level in range(self.levels - 1, 0, -1):
+            if tick & ((1 << (bits * level)) - 1):
+                continue
+            index = (tick >> (bits * level)) & self._mask
+            bucket = self._wheel[level][index]
+            if not bucket:
+                continue
+            self._wheel[level][index] = {}
+            self._counts[level] -= len(bucket)
+            for timer in bucket:
+                self._insert(timer)
+        index = tick & self._mask
+        bucket = self._wheel[0][index]
+        if not bucket:
+            return ()
+        self._wheel[0][index] = {}
+        self._counts[0] -= len(bucket)
+        for timer in bucket:
+            timer._bucket = None
+            if timer.interval is not None:
+                timer.due += timer.interval
+                self._insert(timer)
+        return list(bucket)
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while True:
+                    if self._closed:
+                        return
+                    tick = self._next_tick()
+                    if tick is None:
+                        self._wake = None
+                        condition.wait()
+                        continue
+                    delay = self._start + tick * self.resolution - self.clock()
+                    if delay > 0:
+                        self._wake = tick
+                        condition.wait(delay)
+                        continue
+                    self._wake = -1
+                    timers = self._expire(tick)
+                    if timers:
+                        break
+            for timer in timers:
+                try:
+                    timer.context.run(
+                        self.send,
+                        timer.signal,
+                        timer.sender,
+                        *timer.arguments,
+                        **timer.named,
+                    )
+                except Exception:
+                    self.errors += 1
+                    traceback.print_exc()
+                self.fired += 1
+
+
+_wheel = None
+_wheel_lock = threading.Lock()
+
+
+def _default_wheel():
+    global _wheel
+    with _wheel_lock:
+        if _wheel is None:
+            _wheel = TimerWheel()
+        return _wheel
+
+
+def send_later(delay, signal=All, sender=Anonymous, *arguments, **named):
+    """Send ``signal`` after ``delay`` seconds, with the same arguments
+    as ``dispatcher.send``.
+
+    Uses a timer wheel shared by the process.  Returns a ``Timer``.
+    """
+    return _default_wheel().send_later(delay, signal, sender, *arguments, **named)
+
+
+def send_every(interval, signal=All, sender=Anonymous, *arguments, **named):
+    """Send ``signal`` every ``interval`` seconds, with the same
+    arguments as ``dispatcher.send``.
+
+    Uses a timer wheel shared by the process.  Returns a ``Timer``.
+    """
+    return _default_wheel().send_every(interval, signal, sender, *arguments, **named)
@@ -0,0 +1,188 @@
+"""Causality tracing of sends.
+
+A ``TracePlugin`` records a span for every send and for every receiver
+call.  A receiver span is a child of the send which called the
+receiver, and a send made from within a receiver is a child of that
+receiver's span, so the spans of a send form a tree.
+
+The current span is kept in a ``contextvars.ContextVar``.  The send
+span of a receiver call is captured when the receiver is wrapped, so
+the link survives receivers called later from mailbox workers or
+event loops, and ``EventBus``, ``PriorityBus`` and ``TimerWheel`` send
+in the context of the code which posted or scheduled the signal.
+
+A send span ends when the last of its receiver calls returns, which
+also covers receivers called later from mailboxes or event loops.
+"""
+
+import collections
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+from louie.plugin import Plugin
+
+# The span of the receiver being called.
+_current = contextvars.ContextVar("louie_trace_current", default=None)
+
+# The span of the send whose receivers are being called.
+_sending = contextvars.ContextVar("louie_trace_sending", default=None)
+
+# Current span of the sends below a root send which was not sampled.
+_UNSAMPLED = object()
+
+_ids = itertools.count(1)
+
+
+class Span(object):
+    """A traced send or receiver call.
+
+    - ``kind``: ``"send"`` or ``"receive"``.
+
+    - ``name``: The signal for a send, the receiver's qualified name
+      for a receiver call.
+
+    - ``parent``: The ``id`` of the parent span, or ``None``.
+
+    - ``start``, ``end``: Clock times.  ``end`` is ``None`` while the
+      span is open.
+    """
+
+    __slots__ = ("id", "parent", "kind", "name", "start", "end", "thread")
+
+    def __init__(self, parent, kind, name, start):
+        self.id = next(_ids)
+        self.parent = parent
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.end = None
+        self.thread = threading.get_ident()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.id} {self.kind} {self.name}>"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _call_unsampled(receiver, *arguments, **named):
+    current = _current.set(_UNSAMPLED)
+    try:
+        return receiver(*arguments, **named)
+    finally:
+        _current.reset(current)
+
+
+class TracePlugin(Plugin):
+    """Plugin for Louie that records a span for every send and
+    receiver call.
+
+    - ``rate``: Fraction of sends traced.  Sampling is decided for
+      each root send, which is not made from a receiver; all spans
+      below a sampled send are traced, and none below a send which
+      was not sampled.
+
+    - ``limit``: Maximum number of spans kept.  The oldest spans are
+      discarded first.
+
+    - ``clock``: Callable returning span times, in seconds.
+    """
+
+    def __init__(self, rate=1.0, limit=100000, clock=time.perf_counter):
+        self.rate = rate
+        self.clock = clock
+        self.spans = collections.deque(maxlen=limit)
+
+    def clear(self):
+        """Discard the recorded spans."""
+        self.spans.clear()
+
+    def on_send(self, signal, sender, arguments, named):
+        parent = _current.get()
+        if parent is _UNSAMPLED or (
+            parent is None and self.rate < 1.0 and random.random() >= self.rate
+        ):
+            _sending.set(_UNSAMPLED)
+            return
+        span = Span(
+            None if parent is None else parent.id,
+            "send",
+            str(signal),
+            self.clock(),
+        )
+        span.end = span.start
+        self.spans.append(span)
+        _sending.set(span)
+
+    def wrap_receiver(self, receiver):
+        send = _sending.get()
+        if send is None:
+            return receiver
+        if send is _UNSAMPLED:
+            # Sends made by the receiver are not sampled either.
+            wrapper = functools.partial(_call_unsampled, receiver)
+            wrapper.__wrapped__ = receiver
+            return wrapper
+        original = inspect.unwrap(receiver)
+        name = getattr(original, "__qualname__", None) or repr(original)
+        clock = self.clock
+        spans = self.spans
+
+        def traced(*arguments, **named):
+            span = Span(send.id, "receive", name, clock())
+            spans.append(span)
+            current = _current.set(span)
+            # Restore the outer send after sends made by the receiver.
+            sending = _sending.set(send)
+            try:
+                return receiver(*arguments, **named)
+            finally:
+                _sending.reset(sending)
+                _current.reset(current)
+                span.end = end = clock()
+                if end > send.end:
+                    send.end = end
+
+        traced.__wrapped__ = receiver
+        return traced
+
+    def export_json(self, file):
+        """Write the spans to ``file``, a path or text file object, as
+        a JSON list of objects."""
+        self._dump([span.as_dict() for span in list(self.spans)], file)
+
+    def export_chrome_trace(self, file):
+        """Write the spans to ``file``, a path or text file object, in
+        the Chrome trace event format, for ``chrome://tracing`` or
+        Perfetto."""
+        pid = os.getpid()
+        events = []
+        for span in list(self.spans):
+            end = span.start if span.end is None else span.end
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": (end - span.start) * 1e6,
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": {"id": span.id, "parent": span.parent},
+                }
+            )
+        self._dump({"traceEvents": events}, file)
+
+    def _dump(self, data, file):
+        if isinstance(file, str) or hasattr(file, "__fspath__"):
+            with open(file, "w") as stream:
+                json.dump(data, stream, default=str)
+        else:
+            json.dump(data, file, default=str)
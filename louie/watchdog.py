@@ -0,0 +1,203 @@
+"""Detection of slow receivers.
+
+A ``WatchdogPlugin`` times every receiver call and reports calls which
+take longer than a threshold.  A watchdog thread also checks the calls
+in progress, so a receiver which hangs is reported while it is still
+running, optionally with a sample of its stack.
+
+Each slow call is reported once, as a ``SlowCall``, to a callback or
+to a bounded buffer of recent reports.
+"""
+
+import collections
+import contextvars
+import inspect
+import sys
+import threading
+import time
+import traceback
+
+from louie.plugin import Plugin
+
+# The signal whose receivers are being wrapped.
+_signal = contextvars.ContextVar("louie_watchdog_signal", default=None)
+
+
+class SlowCall(object):
+    """Report of a slow receiver call.
+
+    - ``receiver``: The receiver's qualified name.
+
+    - ``signal``: The signal sent.
+
+    - ``elapsed``: Seconds the call had taken when it was reported.
+
+    - ``running``: Whether the call was still running when reported.
+
+    - ``stack``: The sampled stack of a running call, as formatted by
+      ``traceback.format_stack``, or ``None``.
+    """
+
+    __slots__ = ("receiver", "signal", "elapsed", "running", "stack")
+
+    def __init__(self, receiver, signal, elapsed, running, stack=None):
+        self.receiver = receiver
+        self.signal = signal
+        self.elapsed = elapsed
+        self.running = running
+        self.stack = stack
+
+    def __repr__(self):
+        state = "running" if self.running else "returned"
+        return (
+            f"<{self.__class__.__name__} {self.receiver} for {self.signal!r} "
+            f"{state} after {self.elapsed:.3f}s>"
+        )
+
+
+class _Call(object):
+    __slots__ = ("receiver", "signal", "thread", "start", "threshold", "reported")
+
+    def __init__(self, receiver, signal, threshold, start):
+        self.receiver = receiver
+        self.signal = signal
+        self.thread = threading.get_ident()
+        self.start = start
+        self.threshold = threshold
+        self.reported = False
+
+
+def _name(receiver):
+    """Name ``receiver`` itself, not the wrappers of other plugins."""
+    receiver = inspect.unwrap(receiver)
+    return getattr(receiver, "__qualname__", None) or repr(receiver)
+
+
+class WatchdogPlugin(Plugin):
+    """Plugin for Louie that reports slow receiver calls.
+
+    - ``threshold``: Seconds a receiver call may take before it is
+      reported.
+
+    - ``thresholds``: Dictionary of ``{ signal : seconds }`` overriding
+      ``threshold`` for particular signals.
+
+    - ``callback``: Called with each ``SlowCall``.  By default reports
+      are kept in ``reports``, holding the latest ``capacity`` reports.
+
+    - ``interval``: Seconds between checks of the calls in progress by
+      the watchdog thread, or ``None`` to only report calls when they
+      return.
+
+    - ``sample_stack``: Whether to sample the stack of calls reported
+      while still running.
+
+    - ``clock``: Monotonic clock callable, in seconds.
+
+    The watchdog thread is started on the first receiver call.  Call
+    ``stop`` to stop it for good; calls are then only reported when
+    they return.
+    """
+
+    def __init__(
+        self,
+        threshold=0.1,
+        thresholds=None,
+        callback=None,
+        capacity=1000,
+        interval=0.01,
+        sample_stack=False,
+        clock=time.monotonic,
+    ):
+        self.threshold = threshold
+        self.thresholds = {} if thresholds is None else dict(thresholds)
+        self.reports = collections.deque(maxlen=capacity)
+        self.callback = self.reports.append if callback is None else callback
+        self.interval = interval
+        self.sample_stack = sample_stack
+        self.clock = clock
+        # { id(call) : call }
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def on_send(self, signal, sender, arguments, named):
+        _signal.set(signal)
+
+    def wrap_receiver(self, receiver):
+        signal = _signal.get()
+        threshold = self.thresholds.get(signal, self.threshold)
+        name = _name(receiver)
+        calls = self._calls
+        if (
+            self._thread is None
+            and self.interval is not None
+            and not self._stopped.is_set()
+        ):
+            self._start()
+
+        def watched(*arguments, **named):
+            call = _Call(name, signal, threshold, self.clock())
+            key = id(call)
+            calls[key] = call
+            # Restore the signal after sends made by the receiver.
+            token = _signal.set(signal)
+            try:
+                return receiver(*arguments, **named)
+            finally:
+                _signal.reset(token)
+                elapsed = self.clock() - call.start
+                with self._lock:
+                    del calls[key]
+                    report = elapsed > threshold and not call.reported
+                    call.reported = True
+                if report:
+                    self.callback(SlowCall(name, signal, elapsed, False))
+
+        watched.__wrapped__ = receiver
+        return watched
+
+    def stop(self):
+        """Stop the watchdog thread, which is not started again."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self):
+        """Report the calls in progress which exceeded their threshold.
+
+        Called periodically by the watchdog thread.
+        """
+        now = self.clock()
+        slow = []
+        with self._lock:
+            for call in list(self._calls.values()):
+                if not call.reported and now - call.start > call.threshold:
+                    call.reported = True
+                    slow.append(call)
+        if not slow:
+            return
+        frames = sys._current_frames() if self.sample_stack else {}
+        for call in slow:
+            stack = None
+            frame = frames.get(call.thread)
+            if frame is not None:
+                stack = traceback.format_stack(frame)
+            self.callback(
+                SlowCall(call.receiver, call.signal, now - call.start, True, stack)
+            )
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None or self._stopped.is_set():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="louie-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()